@@ -5,6 +5,6 @@ A CAMEL-based multi-agent system for OSINT collection, verification, and reporti
 """
 
 from app.config.config import config
-from app.orchestrator import orchestrator
+from app.orchestrator import Orchestrator
 
 __version__ = "0.1.0" 
\ No newline at end of file
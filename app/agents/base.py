@@ -1,10 +1,22 @@
 import os
 import json
-from typing import Dict, List, Any, Callable, Awaitable
+from typing import Dict, List, Any, AsyncIterator, Callable, Awaitable
 import asyncio
+import random
+from collections import deque
 
 import openai
 from app.config.config import config
+from app.http_session import get_openai_client
+from app.logging_config import logger
+
+# Errors worth retrying: timeouts, dropped connections, rate limits and server-side failures
+_RETRYABLE_LLM_ERRORS = (
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.RateLimitError,
+    openai.InternalServerError,
+)
 
 class BaseAgent:
     """
@@ -22,11 +34,13 @@ class BaseAgent:
         """
         self.name = name
         self.prompt_template = prompt_template
-        self.tools = {}  # Tool registry
-        self.memory = []  # Simple memory for context
-        
-        # Configure OpenAI API
-        self.openai_client = openai.AsyncOpenAI(api_key=config.OPENAI_API_KEY)
+        self.tools = {}  # Tool registry: name -> (is_async, tool_func)
+        self.memory = deque(maxlen=config.AGENT_MEMORY_MAX)  # Simple bounded memory for context
+    
+    @property
+    def openai_client(self) -> openai.AsyncOpenAI:
+        """The OpenAI client shared across all agents."""
+        return get_openai_client()
         
     def register_tool(self, tool_name: str, tool_func: Callable) -> None:
         """
@@ -36,7 +50,20 @@ class BaseAgent:
             tool_name: The name of the tool
             tool_func: The function that implements the tool
         """
-        self.tools[tool_name] = tool_func
+        # Resolve whether the tool is async once, rather than on every call
+        self.tools[tool_name] = (asyncio.iscoroutinefunction(tool_func), tool_func)
+    
+    def register_tools(self, tools: Dict[str, Callable]) -> None:
+        """
+        Register several tools at once.
+        
+        Args:
+            tools: Mapping of tool name to the function that implements the tool
+        """
+        self.tools.update(
+            (tool_name, (asyncio.iscoroutinefunction(tool_func), tool_func))
+            for tool_name, tool_func in tools.items()
+        )
         
     async def call_tool(self, tool_name: str, **kwargs) -> Any:
         """
@@ -49,31 +76,101 @@ class BaseAgent:
         Returns:
             The result of the tool call
         """
-        if tool_name not in self.tools:
-            raise ValueError(f"Tool '{tool_name}' is not registered with {self.name}")
-        
-        tool_func = self.tools[tool_name]
+        try:
+            is_async, tool_func = self.tools[tool_name]
+        except KeyError:
+            raise ValueError(f"Tool '{tool_name}' is not registered with {self.name}") from None
         
         # If the tool is async, await it, otherwise run it
-        if asyncio.iscoroutinefunction(tool_func):
+        if is_async:
             return await tool_func(**kwargs)
-        else:
-            return tool_func(**kwargs)
+        return tool_func(**kwargs)
+    
+    async def _with_retries(self, request: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run an LLM request, retrying transient failures (including timeouts) with jittered
+        exponential backoff, up to LLM_MAX_RETRIES times after the first attempt.
+        
+        Args:
+            request: Zero-argument callable returning a fresh awaitable for each attempt; it should
+                apply LLM_TIMEOUT_S to the request itself, so a timed-out request is really abandoned
+            
+        Returns:
+            The result of the first successful attempt
+            
+        Raises:
+            The last error once all attempts are exhausted, or immediately for non-transient errors
+        """
+        attempts = config.LLM_MAX_RETRIES + 1
+        for attempt in range(1, attempts + 1):
+            try:
+                return await request()
+            except _RETRYABLE_LLM_ERRORS as e:
+                if attempt == attempts:
+                    raise
+                delay = min(10.0, 2 ** (attempt - 1)) + random.uniform(0, 1)
+                logger.warning("LLM call failed (%r), retrying in %.1fs (attempt %s/%s)", e, delay, attempt, attempts)
+                await asyncio.sleep(delay)
     
     async def call_llm(self, messages: List[Dict[str, str]]) -> str:
         """
         Call the LLM with the given messages using the new OpenAI Python SDK (>=1.0.0) async client.
+        Raises if the call still fails after retries.
         """
-        try:
-            response = await self.openai_client.chat.completions.create(
-                model=config.LLM_MODEL,
-                messages=messages,
-                temperature=0.2,
-            )
-            return response.choices[0].message.content
-        except Exception as e:
-            print(f"Error calling LLM: {e}")
-            return f"Error: {str(e)}"
+        response = await self._with_retries(lambda: self.openai_client.chat.completions.create(
+            model=config.LLM_MODEL,
+            messages=messages,
+            temperature=0.2,
+            timeout=config.LLM_TIMEOUT_S,
+        ))
+        return response.choices[0].message.content
+    
+    async def call_llm_function(self, messages: List[Dict[str, str]], function: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Call the LLM, forcing it to respond with a call to the given function.
+        Raises if the call still fails after retries or the model returns no function call.
+        
+        Args:
+            messages: The messages to send to the LLM
+            function: The function definition (name, description, JSON schema parameters)
+            
+        Returns:
+            The parsed function call arguments
+        """
+        response = await self._with_retries(lambda: self.openai_client.chat.completions.create(
+            model=config.LLM_MODEL,
+            messages=messages,
+            temperature=0.2,
+            tools=[{"type": "function", "function": function}],
+            tool_choice={"type": "function", "function": {"name": function["name"]}},
+            timeout=config.LLM_TIMEOUT_S,
+        ))
+        tool_calls = response.choices[0].message.tool_calls
+        if not tool_calls:
+            raise ValueError(f"LLM did not call function '{function['name']}'")
+        return json.loads(tool_calls[0].function.arguments)
+    
+    async def call_llm_stream(self, messages: List[Dict[str, str]]) -> AsyncIterator[str]:
+        """
+        Call the LLM with the given messages and yield the response text as it streams in.
+        Opening the stream is retried; raises if it still fails after retries.
+        
+        Args:
+            messages: The messages to send to the LLM
+            
+        Yields:
+            Chunks of the response text
+        """
+        response = await self._with_retries(lambda: self.openai_client.chat.completions.create(
+            model=config.LLM_MODEL,
+            messages=messages,
+            temperature=0.2,
+            stream=True,
+            timeout=config.LLM_TIMEOUT_S,
+        ))
+        async for chunk in response:
+            if chunk.choices:
+                yield chunk.choices[0].delta.content or ""
     
     def format_prompt(self, **kwargs) -> str:
         """
@@ -89,7 +186,7 @@ class BaseAgent:
     
     def add_to_memory(self, item: Any) -> None:
         """
-        Add an item to the agent's memory.
+        Add an item to the agent's memory, evicting the oldest item once full.
         
         Args:
             item: The item to add to memory
@@ -103,4 +200,4 @@ class BaseAgent:
         Returns:
             The agent's memory
         """
-        return self.memory 
\ No newline at end of file
+        return list(self.memory)
\ No newline at end of file
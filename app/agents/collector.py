@@ -1,14 +1,80 @@
 import os
 import json
-from typing import Dict, List, Any
+from typing import Dict, List, Any, AsyncIterator, Callable, Optional, Tuple
 import asyncio
+import hashlib
+from collections import OrderedDict
 from datetime import datetime
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 
 from app.agents.base import BaseAgent
 from app.config.config import config
-from app.tools.search import web_search, social_media_search
-from app.tools.media import download_media, extract_metadata
+from app.tools.search import web_search, social_media_search, combined_search
+from app.tools.media import download_media, download_many, extract_metadata
 from app.logging_config import logger
+from app.models import CollectedItem
+
+# Function the LLM is forced to call, so search terms come back as a JSON list
+EMIT_SEARCH_TERMS_FUNCTION = {
+    "name": "emit_search_terms",
+    "description": "Emit the search terms to use for collecting OSINT data.",
+    "parameters": {
+        "type": "object",
+        "properties": {
+            "terms": {
+                "type": "array",
+                "items": {"type": "string"},
+                "maxItems": 5
+            }
+        },
+        "required": ["terms"]
+    }
+}
+
+# Static system prompt, kept byte-identical across calls so the provider can cache the prefix
+COLLECTOR_SYSTEM_PROMPT = "You are a Collector Agent in an OSINT system. Based on the user query, generate 3-5 specific search terms that would help gather relevant information. Focus on finding evidence related to the query."
+
+# Click-tracking query parameters that don't change the page a URL points to
+TRACKING_PARAMS = frozenset({"fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "igshid", "ref_src"})
+
+def canonical_url(url: str) -> str:
+    """
+    Canonicalize a URL for de-duplication: lowercase the scheme and host, drop the
+    fragment, utm_* and other click-tracking parameters.
+    
+    Args:
+        url: The URL to canonicalize
+        
+    Returns:
+        The canonical form of the URL
+    """
+    parts = urlsplit(url.strip())
+    query = urlencode([(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                       if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS])
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, query, ""))
+
+def _dedupe_by_url(pairs: List[Tuple[str, Any]], get_url: Callable[[Any], Optional[str]] = lambda result: result.get("url")) -> List[Tuple[str, Any]]:
+    """
+    Drop (term, result) pairs whose result URL was already seen. Results without a URL are kept.
+    
+    Args:
+        pairs: The (search term, result) pairs in collection order
+        get_url: Returns a result's URL (defaults to the "url" key of a result dict)
+        
+    Returns:
+        The pairs with duplicate URLs removed, preserving order
+    """
+    seen = set()
+    unique = []
+    for term, result in pairs:
+        url = get_url(result)
+        if url:
+            key = canonical_url(url)
+            if key in seen:
+                continue
+            seen.add(key)
+        unique.append((term, result))
+    return unique
 
 class CollectorAgent(BaseAgent):
     """
@@ -21,123 +87,279 @@ class CollectorAgent(BaseAgent):
         super().__init__("Collector", config.COLLECTOR_PROMPT_TEMPLATE)
         
         # Register tools
-        self.register_tool("web_search", web_search)
-        self.register_tool("social_media_search", social_media_search)
-        self.register_tool("download_media", download_media)
-        self.register_tool("extract_metadata", extract_metadata)
+        self.register_tools({
+            "web_search": web_search,
+            "combined_search": combined_search,
+            "social_media_search": social_media_search,
+            "download_media": download_media,
+            "download_many": download_many,
+            "extract_metadata": extract_metadata
+        })
+        
+        # LRU cache of LLM-generated search terms, keyed by query digest
+        self._search_terms_cache: "OrderedDict[str, List[str]]" = OrderedDict()
     
-    async def collect(self, query: str) -> List[Dict[str, Any]]:
+    async def _generate_search_terms(self, query: str, messages: List[Dict[str, str]]) -> List[str]:
         """
-        Collect OSINT data based on the user query.
+        Ask the LLM for search terms, reusing cached terms for repeated queries.
         
         Args:
             query: The user's OSINT query
+            messages: The messages to send to the LLM on a cache miss
             
         Returns:
-            A list of collected data items
+            The search terms generated for the query
+        """
+        key = hashlib.blake2b(query.strip().encode("utf-8"), digest_size=16).hexdigest()
+        
+        cached = self._search_terms_cache.get(key)
+        if cached is not None:
+            self._search_terms_cache.move_to_end(key)
+            logger.info("CollectorAgent: Using cached search terms for query: %s", query)
+            return cached
+        
+        arguments = await self.call_llm_function(messages, EMIT_SEARCH_TERMS_FUNCTION)
+        search_terms = [term.strip() for term in arguments.get("terms", []) if isinstance(term, str) and term.strip()]
+        
+        self._search_terms_cache[key] = search_terms
+        if len(self._search_terms_cache) > config.SEARCH_TERMS_CACHE_SIZE:
+            self._search_terms_cache.popitem(last=False)
+        
+        return search_terms
+    
+    async def _fetch_media(self, media_urls: List[str]) -> Dict[str, Tuple[str, Dict[str, Any]]]:
+        """
+        Download media files concurrently and extract their metadata.
+        
+        Args:
+            media_urls: The URLs of the media to download; duplicates are downloaded once
+            
+        Returns:
+            A mapping from media URL to (media_path, media_metadata) for each successful download
+        """
+        unique_urls = list(dict.fromkeys(media_urls))
+        if not unique_urls:
+            return {}
+        
+        logger.info("CollectorAgent: Downloading %s media files", len(unique_urls))
+        try:
+            # Each query gets its own download concurrency budget
+            media_paths = await self.call_tool(
+                "download_many",
+                urls=unique_urls,
+                concurrency=config.MAX_CONCURRENT_DOWNLOADS
+            )
+        except Exception as e:
+            logger.error("Error downloading media: %s", e)
+            return {}
+        
+        downloaded = []
+        for media_url, media_path in zip(unique_urls, media_paths):
+            if isinstance(media_path, Exception):
+                logger.error("Error downloading media from %s: %s", media_url, media_path)
+            elif media_path:
+                downloaded.append((media_url, media_path))
+        
+        logger.info("CollectorAgent: Extracting metadata for %s media files", len(downloaded))
+        metadata_results = await asyncio.gather(
+            *[self.call_tool("extract_metadata", file_path=media_path) for _, media_path in downloaded],
+            return_exceptions=True
+        )
+        
+        media = {}
+        for (media_url, media_path), media_metadata in zip(downloaded, metadata_results):
+            if isinstance(media_metadata, Exception):
+                logger.error("Error extracting metadata from %s: %s", media_path, media_metadata)
+                continue
+            media[media_url] = (media_path, media_metadata)
+        return media
+    
+    async def _run_web(self, search_terms: List[str], now_iso: str, max_results: int = 5) -> List[CollectedItem]:
+        """
+        Run web searches for all search terms concurrently. With COLLECTOR_COMBINED_SEARCH
+        enabled, each term also covers recent news in the same call.
+        
+        Args:
+            search_terms: The search terms to query
+            now_iso: Fallback timestamp for results without a date
+            max_results: Maximum number of results per search term
+            
+        Returns:
+            A list of collected web data items
+        """
+        if config.COLLECTOR_COMBINED_SEARCH:
+            tool_name, tool_args = "combined_search", {}
+        else:
+            tool_name, tool_args = "web_search", {"max_results": max_results}
+        for term in search_terms:
+            logger.info("CollectorAgent: Using %s tool for term: %s", tool_name, term)
+        web_tasks = [self.call_tool(tool_name, query=term, **tool_args) for term in search_terms]
+        web_results_all = await asyncio.gather(*web_tasks, return_exceptions=True)
+        
+        web_pairs = []
+        news_pairs = []
+        for term, web_results in zip(search_terms, web_results_all):
+            if isinstance(web_results, Exception):
+                logger.error("Error in web search for '%s': %s", term, web_results)
+                continue
+            if isinstance(web_results, dict):
+                # Combined search returns web and news results together
+                web_pairs.extend((term, result) for result in web_results["web"][:max_results])
+                news_pairs.extend((term, result) for result in web_results["news"][:max_results])
+            else:
+                web_pairs.extend((term, result) for result in web_results)
+        
+        web_pairs = _dedupe_by_url(web_pairs)
+        news_pairs = _dedupe_by_url(news_pairs)
+        
+        return [
+            CollectedItem(
+                id=f"{source}_{i}",
+                source=source,
+                source_name=result.get("source", "Unknown"),
+                url=result.get("url", ""),
+                title=result.get("title", ""),
+                content=result.get("snippet", ""),
+                timestamp=result.get("date", now_iso),
+                search_term=term
+            )
+            for source, pairs in (("web", web_pairs), ("news", news_pairs))
+            for i, (term, result) in enumerate(pairs)
+        ]
+    
+    async def _run_social(self, search_terms: List[str], now_iso: str, max_results: int = 5) -> List[CollectedItem]:
+        """
+        Run social media searches for all search terms concurrently and download attached media.
+        
+        Args:
+            search_terms: The search terms to query
+            now_iso: Fallback timestamp for results without a date
+            max_results: Maximum number of results per search term
+            
+        Returns:
+            A list of collected social media data items
+        """
+        for term in search_terms:
+            logger.info("CollectorAgent: Using social_media_search tool for term: %s", term)
+        social_tasks = [
+            self.call_tool("social_media_search",
+                           query=term,
+                           platforms=["twitter", "reddit"],
+                           max_results=max_results)
+            for term in search_terms
+        ]
+        social_results_all = await asyncio.gather(*social_tasks, return_exceptions=True)
+        
+        social_pairs = []
+        for term, social_results in zip(search_terms, social_results_all):
+            if isinstance(social_results, Exception):
+                logger.error("Error in social media search for '%s': %s", term, social_results)
+                continue
+            social_pairs.extend((term, result) for result in social_results)
+        
+        social_pairs = _dedupe_by_url(social_pairs, lambda post: post.url)
+        
+        # Download media for all results concurrently (bounded)
+        media = await self._fetch_media([
+            post.media_url for _, post in social_pairs if post.media_url
+        ])
+        media_results = [media.get(post.media_url, (None, {})) for _, post in social_pairs]
+        
+        return [
+            CollectedItem(
+                id=f"social_{i}",
+                source="social_media",
+                source_name=post.platform or "Unknown",
+                user=post.user or "Unknown",
+                url=post.url or "",
+                content=post.text or "",
+                timestamp=post.date or now_iso,
+                search_term=term,
+                media_path=media_path,
+                media_metadata=media_metadata,
+                metadata={
+                    "likes": post.likes,
+                    "shares": post.shares,
+                    "comments": post.comments
+                }
+            )
+            for i, ((term, post), (media_path, media_metadata)) in enumerate(zip(social_pairs, media_results))
+        ]
+    
+    async def collect_stream(self, query: str, max_results: int = 5) -> AsyncIterator[List[CollectedItem]]:
         """
-        logger.info(f"CollectorAgent: Collecting data for query: {query}")
+        Collect OSINT data based on the user query, yielding each source's items
+        as soon as that source finishes so downstream stages can start early.
+        
+        Args:
+            query: The user's OSINT query
+            max_results: Maximum number of results per search term and source
+            
+        Yields:
+            Lists of collected data items, one per source
+        """
+        logger.info("CollectorAgent: Collecting data for query: %s", query)
+        # Shared fallback timestamp for results that come without a date
+        now_iso = datetime.now().isoformat()
         # Generate a collection prompt from the user query
         prompt = self.format_prompt(user_query=query)
         
         # Call LLM to decide what to search for
         messages = [
-            {"role": "system", "content": "You are a Collector Agent in an OSINT system. Based on the user query, generate 3-5 specific search terms that would help gather relevant information. Focus on finding evidence related to the query."},
+            {"role": "system", "content": COLLECTOR_SYSTEM_PROMPT},
             {"role": "user", "content": f"User Query: {query}\n\nGenerate search terms:"}
         ]
         
-        search_terms_response = await self.call_llm(messages)
+        try:
+            search_terms = await self._generate_search_terms(query, messages)
+        except Exception as e:
+            logger.error("Error generating search terms: %s", e)
+            search_terms = []
         
-        # Parse the search terms (assuming they're numbered or listed)
-        search_terms = []
-        for line in search_terms_response.split("\n"):
-            line = line.strip()
-            if line and (line.startswith("-") or line.startswith("*") or 
-                        any(line.startswith(f"{i}.") for i in range(1, 10))):
-                term = line.split(" ", 1)[1].strip() if " " in line else line
-                search_terms.append(term)
+        # Drop duplicate terms (case-insensitive), keeping the first spelling
+        unique_terms = {}
+        for term in search_terms:
+            unique_terms.setdefault(term.strip().lower(), term.strip())
+        search_terms = list(unique_terms.values())
         
-        # If no terms were parsed properly, use the query itself
+        # If no terms were generated, use the query itself
         if not search_terms:
             search_terms = [query]
         
-        # Collect data from different sources
-        collected_data = []
-        
-        # Web search
-        for term in search_terms:
-            try:
-                logger.info(f"CollectorAgent: Using web_search tool for term: {term}")
-                web_results = await self.call_tool("web_search", query=term, max_results=5)
-                for result in web_results:
-                    collected_data.append({
-                        "id": f"web_{len(collected_data)}",
-                        "source": "web",
-                        "source_name": result.get("source", "Unknown"),
-                        "url": result.get("url", ""),
-                        "title": result.get("title", ""),
-                        "content": result.get("snippet", ""),
-                        "timestamp": result.get("date", datetime.now().isoformat()),
-                        "search_term": term,
-                        "metadata": {}
-                    })
-            except Exception as e:
-                logger.error(f"Error in web search for '{term}': {e}")
-        
-        # Social media search
-        for term in search_terms:
-            try:
-                logger.info(f"CollectorAgent: Using social_media_search tool for term: {term}")
-                social_results = await self.call_tool("social_media_search", 
-                                                     query=term, 
-                                                     platforms=["twitter", "reddit"],
-                                                     max_results=5)
-                
-                for result in social_results:
-                    # Download media if present
-                    media_path = None
-                    media_metadata = {}
-                    
-                    if "media_url" in result and result["media_url"]:
-                        try:
-                            logger.info(f"CollectorAgent: Downloading media for url: {result['media_url']}")
-                            media_path = await self.call_tool("download_media", 
-                                                           url=result["media_url"])
-                            
-                            if media_path:
-                                logger.info(f"CollectorAgent: Extracting metadata for media: {media_path}")
-                                media_metadata = await self.call_tool("extract_metadata", 
-                                                                    file_path=media_path)
-                        except Exception as e:
-                            logger.error(f"Error downloading media: {e}")
-                    
-                    collected_data.append({
-                        "id": f"social_{len(collected_data)}",
-                        "source": "social_media",
-                        "source_name": result.get("platform", "Unknown"),
-                        "user": result.get("user", "Unknown"),
-                        "url": result.get("url", ""),
-                        "content": result.get("text", ""),
-                        "timestamp": result.get("date", datetime.now().isoformat()),
-                        "search_term": term,
-                        "media_path": media_path,
-                        "media_metadata": media_metadata,
-                        "metadata": {
-                            "likes": result.get("likes", 0),
-                            "shares": result.get("shares", 0),
-                            "comments": result.get("comments", 0)
-                        }
-                    })
-            except Exception as e:
-                logger.error(f"Error in social media search for '{term}': {e}")
+        # Collect data from web and social sources concurrently, handing each off as it completes
+        sources = [
+            asyncio.ensure_future(self._run_web(search_terms, now_iso, max_results)),
+            asyncio.ensure_future(self._run_social(search_terms, now_iso, max_results))
+        ]
+        collected_count = 0
+        try:
+            for next_source in asyncio.as_completed(sources):
+                items = await next_source
+                collected_count += len(items)
+                yield items
+        finally:
+            # Don't leave a source running if the consumer stops early
+            for source in sources:
+                source.cancel()
         
         # Add the collection results to memory
         self.add_to_memory({
             "query": query,
             "search_terms": search_terms,
-            "collected_data": collected_data,
-            "timestamp": datetime.now().isoformat()
+            "collected_count": collected_count,
+            "timestamp": now_iso
         })
         
-        logger.info(f"CollectorAgent: Finished collecting data for query: {query}")
-        return collected_data 
\ No newline at end of file
+        logger.info("CollectorAgent: Finished collecting data for query: %s", query)
+    
+    async def collect(self, query: str) -> List[CollectedItem]:
+        """
+        Collect OSINT data based on the user query.
+        
+        Args:
+            query: The user's OSINT query
+            
+        Returns:
+            A list of collected data items
+        """
+        return [item async for items in self.collect_stream(query) for item in items] 
\ No newline at end of file
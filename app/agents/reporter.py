@@ -1,12 +1,32 @@
 import os
-import json
-from typing import Dict, List, Any
+from typing import List, Callable, Optional
 import asyncio
+import io
+import re
+from collections import Counter
 from datetime import datetime
 
 from app.agents.base import BaseAgent
 from app.config.config import config
 from app.logging_config import logger
+from app.models import CollectedItem
+from app.serialization import dumps
+
+# Static system prompt, kept byte-identical across calls so the provider can cache the prefix
+REPORTER_SYSTEM_PROMPT = """You are a Report Writer Agent in an OSINT system. Your task is to create a comprehensive, objective report based on verified data.
+            
+            Format your report in Markdown with the following sections:
+            1. Summary - A brief overview of findings
+            2. Background - Context and explanation of the topic
+            3. Findings - Detailed presentation of the evidence (with subsections as needed)
+            4. Analysis - Interpretation of the evidence and patterns
+            5. Conclusion - Summary of key insights
+            6. Sources - Formatted citations for all sources
+            
+            Present the facts objectively. Cite sources using [ID] notation and include them in the Sources section.
+            Use appropriate formatting like headers, bullet points, and emphasis to make the report readable.
+            When discussing evidence, note the verification methods and confidence levels.
+            """
 
 class ReporterAgent(BaseAgent):
     """
@@ -18,93 +38,105 @@ class ReporterAgent(BaseAgent):
         """Initialize the Reporter Agent."""
         super().__init__("Reporter", config.REPORT_PROMPT_TEMPLATE)
     
-    async def generate_report(self, query: str, verified_data: List[Dict[str, Any]]) -> str:
+    def _embed_media(self, report_content: str, verified_data: List[CollectedItem]) -> str:
+        """
+        Insert a media reference after the first paragraph that cites each item with media.
+        
+        Args:
+            report_content: The Markdown report
+            verified_data: The verified data items cited in the report
+            
+        Returns:
+            The report with media references embedded
+        """
+        embeds = {}
+        for item in verified_data:
+            if item.media_path:
+                media_reference = f"\n\n![Media from {item.id}]({item.media_path})\n"
+                if media_reference not in report_content:
+                    embeds.setdefault(item.id, media_reference)
+        
+        if not embeds:
+            return report_content
+        
+        # A citation such as [web_3], and the rest of its paragraph
+        mention_re = re.compile(r'\[(' + '|'.join(re.escape(i) for i in embeds) + r')\]')
+        paragraph_re = re.compile(mention_re.pattern + r'.*?(?=\n\n)', re.DOTALL)
+        seen = set()
+        
+        # Write fragments and embeds to a buffer in one linear pass over the report
+        buf = io.StringIO()
+        pos = 0
+        for match in paragraph_re.finditer(report_content):
+            buf.write(report_content[pos:match.end()])
+            pos = match.end()
+            for media_id in mention_re.findall(match.group(0)):
+                if media_id not in seen:
+                    seen.add(media_id)
+                    buf.write(embeds[media_id])
+        buf.write(report_content[pos:])
+        
+        return buf.getvalue()
+    
+    async def generate_report(self, query: str, verified_data: List[CollectedItem],
+                              on_delta: Optional[Callable[[str], None]] = None) -> str:
         """
         Generate a comprehensive OSINT report based on verified data.
         
         Args:
             query: The original user query
             verified_data: The verified data from the Verifier Agent
+            on_delta: Optional callback receiving the report text as the LLM streams it,
+                before media references are embedded
             
         Returns:
             A formatted Markdown report
         """
-        logger.info(f"ReporterAgent: Generating report for query: {query}")
-        # Generate a report prompt
-        prompt = self.format_prompt(
-            user_query=query,
-            verified_data=json.dumps(verified_data, indent=2)
-        )
-        
-        # Prepare data for the LLM
-        # First, let's categorize the data
-        categories = {}
-        for item in verified_data:
-            source_type = item.get("source", "other")
-            if source_type not in categories:
-                categories[source_type] = []
-            categories[source_type].append(item)
-        
-        # Create sources for citation
+        logger.info("ReporterAgent: Generating report for query: %s", query)
+        # Prepare data for the LLM in a single pass:
+        # count items per source type, build citations and detect media
+        categories = Counter()
         sources = []
+        has_media = False
         for item in verified_data:
-            source = {
-                "id": item.get("id", "unknown"),
-                "title": item.get("title", item.get("content", "")[:50] + "..."),
-                "url": item.get("url", ""),
-                "source_name": item.get("source_name", "Unknown Source"),
-                "date": item.get("timestamp", "").split("T")[0]
-            }
-            sources.append(source)
+            categories[item.source or "other"] += 1
+            sources.append({
+                "id": item.id,
+                "title": item.title or (item.content or "")[:50] + "...",
+                "url": item.url or "",
+                "source_name": item.source_name or "Unknown Source",
+                "date": (item.timestamp or "").split("T")[0]
+            })
+            has_media = has_media or bool(item.media_path)
         
         # Create a summary for the LLM
         data_summary = {
             "query": query,
-            "categories": {k: len(v) for k, v in categories.items()},
+            "categories": dict(categories),
             "source_count": len(sources),
             "sources": sources,
-            "verified_data_sample": verified_data[:3] if len(verified_data) > 3 else verified_data,
-            "has_media": any("media_path" in item and item["media_path"] for item in verified_data)
+            "verified_data_sample": verified_data[:3],
+            "has_media": has_media
         }
         
         # Call LLM to generate the report
         report_messages = [
-            {"role": "system", "content": """You are a Report Writer Agent in an OSINT system. Your task is to create a comprehensive, objective report based on verified data.
-            
-            Format your report in Markdown with the following sections:
-            1. Summary - A brief overview of findings
-            2. Background - Context and explanation of the topic
-            3. Findings - Detailed presentation of the evidence (with subsections as needed)
-            4. Analysis - Interpretation of the evidence and patterns
-            5. Conclusion - Summary of key insights
-            6. Sources - Formatted citations for all sources
-            
-            Present the facts objectively. Cite sources using [ID] notation and include them in the Sources section.
-            Use appropriate formatting like headers, bullet points, and emphasis to make the report readable.
-            When discussing evidence, note the verification methods and confidence levels.
-            """},
-            {"role": "user", "content": f"User Query: {query}\n\nData Summary: {json.dumps(data_summary, indent=2)}\n\nGenerate a complete OSINT report:"}
+            {"role": "system", "content": REPORTER_SYSTEM_PROMPT},
+            {"role": "user", "content": f"User Query: {query}\n\nData Summary: {dumps(data_summary, indent=True)}\n\nGenerate a complete OSINT report:"}
         ]
         
-        report_content = await self.call_llm(report_messages)
+        report_parts = []
+        async for token in self.call_llm_stream(report_messages):
+            report_parts.append(token)
+            if on_delta and token:
+                on_delta(token)
+        report_content = "".join(report_parts)
         
         # Include any media references if needed
         if data_summary["has_media"]:
             # This would be replaced with actual media embedding in a real implementation
             # For now, we'll just add placeholders in the report
-            for item in verified_data:
-                if "media_path" in item and item["media_path"]:
-                    media_reference = f"\n\n![Media from {item.get('id')}]({item['media_path']})\n"
-                    if media_reference not in report_content:
-                        # Find a good place to insert it - after the first mention of this source
-                        source_mention = f"[{item.get('id')}]"
-                        if source_mention in report_content:
-                            parts = report_content.split(source_mention, 1)
-                            if len(parts) > 1:
-                                # Insert after the first paragraph that mentions this source
-                                paragraph_end = parts[1].find("\n\n")
-                                if paragraph_end > 0:
-                                    report_content = parts[0] + source_mention + parts[1][:paragraph_end] + media_reference + parts[1][paragraph_end:]
+            report_content = self._embed_media(report_content, verified_data)
         
         # Add the report to memory
         self.add_to_memory({
@@ -114,5 +146,5 @@ class ReporterAgent(BaseAgent):
             "timestamp": datetime.now().isoformat()
         })
         
-        logger.info(f"ReporterAgent: Report generated for query: {query}")
+        logger.info("ReporterAgent: Report generated for query: %s", query)
         return report_content 
\ No newline at end of file
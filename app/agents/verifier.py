@@ -1,10 +1,17 @@
 import os
 import json
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, AsyncIterable, AsyncIterator, Optional, Tuple
 import asyncio
+import hashlib
+import logging
+import re
+from dataclasses import asdict
+from operator import itemgetter
 from datetime import datetime
+from urllib.parse import urlsplit
 
 from app.agents.base import BaseAgent
+from app.batching import AsyncBatcher
 from app.config.config import config
 from app.tools.verification import (
     reverse_image_search, 
@@ -14,6 +21,120 @@ from app.tools.verification import (
     check_metadata_consistency
 )
 from app.logging_config import logger
+from app.models import CollectedItem
+from app.serialization import dumps, loads
+from app.validation_cache import ValidationCache
+from app.verification_cache import VerificationCache
+
+VERIFIER_SYSTEM_PROMPT = (
+    "You are a Verification Agent in an OSINT system. You will receive a JSON array of items, each with its "
+    "id, the item data and the results of automated verification checks. For each item, determine if it should "
+    "be considered verified. Respond with only a JSON array with one object per item, of the form "
+    '[{"id": "<item id>", "verified": true or false, "confidence": <number between 0 and 1>, "explanation": "<brief explanation>"}].'
+)
+
+# Fallbacks for responses that aren't valid JSON
+_JSON_ARRAY_RE = re.compile(r'\[.*\]', re.DOTALL)
+_JSON_OBJECT_RE = re.compile(r'\{.*\}', re.DOTALL)
+_CONFIDENCE_RE = re.compile(r'confidence["\'\s:]+([0-9]*\.?[0-9]+)', re.IGNORECASE)
+_VERIFIED_RE = re.compile(r'verified["\'\s:]+(true|false)', re.IGNORECASE)
+_EXPLANATION_RE = re.compile(r'explanation["\'\s:]+(.+)', re.IGNORECASE)
+
+def _decision_from_dict(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalize a decoded JSON decision into verified/confidence/explanation fields."""
+    verified = data.get("verified", False)
+    if isinstance(verified, str):
+        verified = verified.strip().lower() == "true"
+    return {
+        "verified": bool(verified),
+        "confidence": float(data.get("confidence", 0.0)),
+        "explanation": str(data.get("explanation", "")).strip()
+    }
+
+def _parse_decision(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Parse an LLM verification decision.
+    
+    Args:
+        text: The LLM response, ideally a JSON object
+        
+    Returns:
+        A dict with "verified", "confidence" and "explanation", or None if nothing could be parsed
+    """
+    match = _JSON_OBJECT_RE.search(text)
+    if match:
+        try:
+            data = loads(match.group(0))
+            if isinstance(data, dict):
+                return _decision_from_dict(data)
+        except (json.JSONDecodeError, TypeError, ValueError):
+            pass
+    
+    # Fall back to scanning for "key: value" pairs
+    confidence = _CONFIDENCE_RE.search(text)
+    verified = _VERIFIED_RE.search(text)
+    explanation = _EXPLANATION_RE.search(text)
+    if not (confidence or verified or explanation):
+        return None
+    return {
+        "verified": bool(verified) and verified.group(1).lower() == "true",
+        "confidence": float(confidence.group(1)) if confidence else 0.0,
+        "explanation": (explanation.group(1) if explanation else text.split("\n", 1)[0]).strip().strip('",')
+    }
+
+def _parse_decisions(text: str, item_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Parse a batched LLM verification response.
+    
+    Args:
+        text: The LLM response, ideally a JSON array of decisions
+        item_ids: The ids of the items the decisions are for
+        
+    Returns:
+        A mapping from item id to parsed decision; items without a parseable decision are omitted
+    """
+    match = _JSON_ARRAY_RE.search(text)
+    if match:
+        try:
+            data = loads(match.group(0))
+        except json.JSONDecodeError:
+            data = None
+        if isinstance(data, list):
+            decisions = {}
+            for entry in data:
+                if isinstance(entry, dict) and str(entry.get("id")) in item_ids:
+                    try:
+                        decisions[str(entry["id"])] = _decision_from_dict(entry)
+                    except (TypeError, ValueError):
+                        pass
+            return decisions
+    
+    # A single item may come back as a bare object or "key: value" text
+    if len(item_ids) == 1:
+        decision = _parse_decision(text)
+        if decision is not None:
+            return {item_ids[0]: decision}
+    return {}
+
+def _hash_file(path: str, chunk_size: int = 1 << 20) -> str:
+    """
+    Hash a file's content with blake2b, reading it in fixed-size chunks.
+    
+    Args:
+        path: Path to the file
+        chunk_size: Bytes to read per chunk
+        
+    Returns:
+        The hex digest of the file content
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        if hasattr(os, "posix_fadvise"):
+            # Hint a one-pass sequential read so the kernel can read ahead and drop pages early
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
 
 class VerifierAgent(BaseAgent):
     """
@@ -26,196 +147,417 @@ class VerifierAgent(BaseAgent):
         super().__init__("Verifier", config.VERIFICATION_PROMPT_TEMPLATE)
         
         # Register tools
-        self.register_tool("reverse_image_search", reverse_image_search)
-        self.register_tool("geolocate_image", geolocate_image)
-        self.register_tool("analyze_shadows", analyze_shadows)
-        self.register_tool("check_source_reliability", check_source_reliability)
-        self.register_tool("check_metadata_consistency", check_metadata_consistency)
+        self.register_tools({
+            "reverse_image_search": reverse_image_search,
+            "geolocate_image": geolocate_image,
+            "analyze_shadows": analyze_shadows,
+            "check_source_reliability": check_source_reliability,
+            "check_metadata_consistency": check_metadata_consistency
+        })
+        
+        # Limit concurrent image analysis calls across items to avoid hammering upstream APIs
+        self._image_semaphore = asyncio.Semaphore(config.VERIFIER_MAX_CONCURRENT_IMAGE_CHECKS)
+        
+        # Items taken from the collector but not yet verified; no more batches are taken
+        # while this many are in flight, so a lagging verifier holds back collection
+        self._max_in_flight = config.VERIFIER_MAX_IN_FLIGHT
+        
+        # Short-lived cache of tool results shared across queries: image analysis results
+        # (keyed by media content), and any other checks when verify() isn't given a per-query cache
+        self._validation_cache = ValidationCache(config.VALIDATION_CACHE_SIZE, config.VERIFIER_CACHE_TTL_S)
+        
+        # Final LLM decisions are made for several checked items per call
+        self._decision_batcher = AsyncBatcher(
+            config.VERIFIER_DECISION_BATCH_SIZE,
+            config.VERIFIER_DECISION_BATCH_DELAY_MS,
+            self._decide_batch
+        )
+        
+        # Verification results persisted across queries, keyed by item URL and media content
+        self._result_cache = VerificationCache(config.VERIFIER_RESULT_CACHE_PATH, config.VERIFIER_RESULT_CACHE_TTL_S)
     
-    async def verify(self, query: str, collected_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    async def _media_key(self, path: str) -> str:
         """
-        Verify the collected OSINT data.
+        Compute a content hash of a media file for use as a cache key.
+        The file is hashed in chunks in a worker thread, so large media neither
+        sits fully in memory nor blocks the event loop.
+        
+        Args:
+            path: Path to the media file
+            
+        Returns:
+            The hex digest of the file content
+        """
+        return await asyncio.to_thread(_hash_file, path)
+    
+    async def _call_image_tool(self, tool_name: str, **kwargs) -> Any:
+        """
+        Call an image analysis tool, limiting how many run at once across items.
+        
+        Args:
+            tool_name: The name of the tool to call
+            **kwargs: Arguments to pass to the tool
+            
+        Returns:
+            The result of the tool call
+        """
+        async with self._image_semaphore:
+            return await self.call_tool(tool_name, **kwargs)
+    
+    @staticmethod
+    def _source_key(item: CollectedItem) -> Tuple[str, str]:
+        """
+        Get the key identifying an item's source for reliability checks.
+        
+        Args:
+            item: The collected item
+            
+        Returns:
+            The (source name, domain) pair of the item
+        """
+        return (item.source_name or "Unknown", urlsplit(item.url or "").netloc.lower())
+    
+    async def _filter_reliable(self, collected_data: List[CollectedItem], cache: ValidationCache) -> List[Tuple[CollectedItem, Dict[str, Any]]]:
+        """
+        Check source reliability for all items up front, once per distinct source,
+        and drop items from unreliable sources before any expensive checks run.
         
         Args:
-            query: The original user query
             collected_data: The data collected by the Collector Agent
+            cache: Cache of tool results to check first
             
         Returns:
-            A list of verified data items
+            (item, source reliability) pairs for the items whose source is not unreliable
         """
-        logger.info(f"VerifierAgent: Verifying data for query: {query}")
-        # Generate a verification prompt
-        prompt = self.format_prompt(
-            user_query=query,
-            collected_data=json.dumps(collected_data, indent=2)
-        )
+        # Identical sources are only checked once
+        sources: Dict[Tuple[str, str], CollectedItem] = {}
+        for item in collected_data:
+            sources.setdefault(self._source_key(item), item)
         
-        verified_data = []
+        results = await asyncio.gather(
+            *[
+                cache.get_or_call(
+                    ValidationCache.make_key("check_source_reliability", *key),
+                    self.call_tool("check_source_reliability", source_name=key[0], url=item.url or "")
+                )
+                for key, item in sources.items()
+            ],
+            return_exceptions=True
+        )
+        reliabilities = dict(zip(sources, results))
         
-        # Process each collected item
+        survivors = []
         for item in collected_data:
-            # Initialize verification metadata
-            verification = {
-                "verified": False,
-                "confidence": 0.0,
-                "methods": [],
-                "notes": []
-            }
+            source_reliability = reliabilities[self._source_key(item)]
+            if isinstance(source_reliability, Exception):
+                logger.error("Error verifying item %s: %s", item.id, source_reliability)
+            elif source_reliability.get("reliability") != "unreliable":
+                survivors.append((item, source_reliability))
+        
+        logger.info("VerifierAgent: %s of %s items come from sources not known to be unreliable", len(survivors), len(collected_data))
+        return survivors
+    
+    async def _run_checks(self, item: CollectedItem, source_reliability: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Run the automated verification checks on a single collected item.
+        Image analysis results are cached by media content and shared across queries.
+        
+        Args:
+            item: The item to verify
+            source_reliability: The result of the source reliability check for the item
+            
+        Returns:
+            The verification metadata gathered so far, or None if the checks failed
+        """
+        # Initialize verification metadata
+        verification = {
+            "verified": False,
+            "confidence": 0.0,
+            "methods": ["source_reliability_check"],
+            "notes": [f"Source reliability: {source_reliability.get('reliability', 'Unknown')}"]
+        }
+        # Bound once; appended to throughout the checks below
+        methods = verification["methods"]
+        notes = verification["notes"]
+        
+        log_info = logger.isEnabledFor(logging.INFO)
+        metadata_task = None
+        
+        # Bind the fields used repeatedly below
+        item_id = item.id
+        media_path = item.media_path
+        timestamp = item.timestamp or ""
+        verified_location = item.verified_location
+        
+        try:
+            # Items seen in an earlier query (same URL and media content) reuse their results
+            media_key = ""
+            cache_key = None
+            if media_path:
+                try:
+                    media_key = await self._media_key(media_path)
+                except OSError as e:
+                    # An unreadable media file only costs the caching; the item is still verified,
+                    # with its image results cached by path for this process only
+                    logger.warning("VerifierAgent: Could not hash media %s for item %s, not caching its results: %s", media_path, item_id, e)
+            if media_key or not media_path:
+                cache_key = VerificationCache.make_key(item.url or "", media_key)
+                cached = await self._result_cache.get(cache_key)
+                if cached is not None:
+                    if log_info:
+                        logger.info("VerifierAgent: Using cached verification for item %s", item_id)
+                    item.verified_location = cached.get("verified_location")
+                    return cached["verification"]
+            image_key = media_key or media_path
             
-            try:
-                logger.info(f"VerifierAgent: Checking source reliability for {item.get('url', '')}")
-                # Check source reliability
-                source_reliability = await self.call_tool(
-                    "check_source_reliability",
-                    source_name=item.get("source_name", "Unknown"),
-                    url=item.get("url", "")
+            # Metadata consistency doesn't depend on any other check, so start it right away
+            if log_info:
+                logger.info("VerifierAgent: Checking metadata consistency for item %s", item_id)
+            metadata_task = asyncio.create_task(self.call_tool(
+                "check_metadata_consistency",
+                item=asdict(item)
+            ))
+            
+            # For items with media, perform additional verification
+            if media_path:
+                # Reverse image search and geolocation are independent; run them together
+                if log_info:
+                    logger.info("VerifierAgent: Running reverse_image_search for media: %s", media_path)
+                    logger.info("VerifierAgent: Running geolocate_image for media: %s", media_path)
+                reverse_results, geolocate_result = await asyncio.gather(
+                    self._validation_cache.get_or_call(
+                        ValidationCache.make_key("reverse_image_search", image_key),
+                        self._call_image_tool("reverse_image_search", image_path=media_path)
+                    ),
+                    self._validation_cache.get_or_call(
+                        ValidationCache.make_key("geolocate_image", image_key),
+                        self._call_image_tool("geolocate_image", image_path=media_path)
+                    )
                 )
                 
-                verification["methods"].append("source_reliability_check")
-                verification["notes"].append(f"Source reliability: {source_reliability.get('reliability', 'Unknown')}")
+                methods.append("reverse_image_search")
                 
-                # If the source is known to be unreliable, skip this item
-                if source_reliability.get("reliability") == "unreliable":
-                    verification["notes"].append("Source is known to be unreliable. Item rejected.")
-                    continue
-                
-                # For items with media, perform additional verification
-                if "media_path" in item and item["media_path"]:
-                    logger.info(f"VerifierAgent: Running reverse_image_search for media: {item['media_path']}")
-                    # Reverse image search
-                    reverse_results = await self.call_tool(
-                        "reverse_image_search",
-                        image_path=item["media_path"]
+                # Check if the image appears elsewhere
+                matches = reverse_results.get("matches") or []
+                if matches:
+                    claimed_day = timestamp.split("T", 1)[0]
+                    earliest_match = min(
+                        (match for match in matches if "date" in match),
+                        key=itemgetter("date"),
+                        default=None
                     )
                     
-                    verification["methods"].append("reverse_image_search")
-                    
-                    # Check if the image appears elsewhere
-                    if reverse_results.get("matches", []):
-                        earliest_match = min(
-                            reverse_results.get("matches", []), 
-                            key=lambda x: x.get("date", "9999-12-31")
+                    # If the image is older than claimed, flag it
+                    if earliest_match is not None and earliest_match["date"] < claimed_day:
+                        notes.append(
+                            f"WARNING: Image appears to be older than claimed. "
+                            f"Earliest match: {earliest_match.get('date')} "
+                            f"from {earliest_match.get('url')}"
                         )
-                        
-                        # If the image is older than claimed, flag it
-                        if earliest_match.get("date", "") < item.get("timestamp", "").split("T")[0]:
-                            verification["notes"].append(
-                                f"WARNING: Image appears to be older than claimed. "
-                                f"Earliest match: {earliest_match.get('date')} "
-                                f"from {earliest_match.get('url')}"
-                            )
-                        else:
-                            verification["notes"].append("Image verified with reverse search.")
                     else:
-                        verification["notes"].append("No matches found in reverse image search.")
-                    
-                    # Attempt to geolocate the image
-                    logger.info(f"VerifierAgent: Running geolocate_image for media: {item['media_path']}")
-                    geolocate_result = await self.call_tool(
-                        "geolocate_image",
-                        image_path=item["media_path"]
+                        notes.append("Image verified with reverse search.")
+                else:
+                    notes.append("No matches found in reverse image search.")
+                
+                # Record the geolocation result
+                methods.append("geolocation")
+                
+                location = geolocate_result.get("location")
+                if location:
+                    verified_location = item.verified_location = location
+                    notes.append(
+                        f"Geolocation: {location} "
+                        f"(Confidence: {geolocate_result.get('confidence')})"
                     )
-                    
-                    verification["methods"].append("geolocation")
-                    
-                    if geolocate_result.get("location"):
-                        item["verified_location"] = geolocate_result.get("location")
-                        verification["notes"].append(
-                            f"Geolocation: {geolocate_result.get('location')} "
-                            f"(Confidence: {geolocate_result.get('confidence')})"
-                        )
-                    
-                    # Analyze shadows for time verification
-                    logger.info(f"VerifierAgent: Running analyze_shadows for media: {item['media_path']}")
-                    shadow_result = await self.call_tool(
+                
+                # Analyze shadows for time verification (needs the geolocated position)
+                if log_info:
+                    logger.info("VerifierAgent: Running analyze_shadows for media: %s", media_path)
+                shadow_result = await self._validation_cache.get_or_call(
+                    ValidationCache.make_key("analyze_shadows", image_key, verified_location, timestamp),
+                    self._call_image_tool(
                         "analyze_shadows",
-                        image_path=item["media_path"],
-                        claimed_location=item.get("verified_location"),
-                        claimed_time=item.get("timestamp")
+                        image_path=media_path,
+                        claimed_location=verified_location,
+                        claimed_time=timestamp
                     )
-                    
-                    verification["methods"].append("shadow_analysis")
-                    
-                    if shadow_result.get("consistent") is not None:
-                        if shadow_result.get("consistent"):
-                            verification["notes"].append(
-                                f"Shadow analysis confirms claimed time: {item.get('timestamp')}"
-                            )
-                        else:
-                            verification["notes"].append(
-                                f"WARNING: Shadow analysis suggests inconsistency with claimed time. "
-                                f"Estimated time: {shadow_result.get('estimated_time')}"
-                            )
-                
-                # Check metadata consistency
-                logger.info(f"VerifierAgent: Checking metadata consistency for item {item.get('id', 'unknown')}")
-                metadata_check = await self.call_tool(
-                    "check_metadata_consistency",
-                    item=item
                 )
                 
-                verification["methods"].append("metadata_consistency")
-                verification["notes"].append(f"Metadata check: {metadata_check.get('result', 'Unknown')}")
+                methods.append("shadow_analysis")
                 
-                # Call LLM to make a final verification decision based on all the evidence
-                verification_messages = [
-                    {"role": "system", "content": "You are a Verification Agent in an OSINT system. Evaluate the item and verification results to determine if this item should be considered verified. Return a confidence score (0-1) and a brief explanation."},
-                    {"role": "user", "content": f"Item: {json.dumps(item, indent=2)}\nVerification Results: {json.dumps(verification, indent=2)}"}
-                ]
-                
-                verification_decision = await self.call_llm(verification_messages)
+                consistent = shadow_result.get("consistent")
+                if consistent is not None:
+                    if consistent:
+                        notes.append(
+                            f"Shadow analysis confirms claimed time: {timestamp}"
+                        )
+                    else:
+                        notes.append(
+                            f"WARNING: Shadow analysis suggests inconsistency with claimed time. "
+                            f"Estimated time: {shadow_result.get('estimated_time')}"
+                        )
+            
+            # Collect the metadata consistency check started above
+            metadata_check = await metadata_task
+            
+            methods.append("metadata_consistency")
+            notes.append(f"Metadata check: {metadata_check.get('result', 'Unknown')}")
+            
+            if cache_key is not None:
+                await self._result_cache.set(cache_key, {
+                    "verification": verification,
+                    "verified_location": verified_location
+                })
+            return verification
+        
+        except Exception as e:
+            logger.error("Error verifying item %s: %s", item_id, e)
+        finally:
+            # Don't leave the metadata check running for failed items
+            if metadata_task is not None and not metadata_task.done():
+                metadata_task.cancel()
+        
+        return None
+    
+    async def _decide_batch(self, batch: List[Tuple[CollectedItem, Dict[str, Any]]]) -> List[bool]:
+        """
+        Ask the LLM for final verification decisions on a batch of checked items in one call.
+        
+        Args:
+            batch: (item, verification) pairs whose automated checks have completed
+            
+        Returns:
+            Whether each item in the batch was verified, in order
+        """
+        payload = [
+            {"id": item.id, "item": item, "verification": verification}
+            for item, verification in batch
+        ]
+        verification_messages = [
+            {"role": "system", "content": VERIFIER_SYSTEM_PROMPT},
+            {"role": "user", "content": f"Items: {dumps(payload)}"}
+        ]
+        
+        try:
+            verification_decision = await self.call_llm(verification_messages)
+            decisions = _parse_decisions(verification_decision, [item.id for item, _ in batch])
+        except Exception as e:
+            logger.error("Error getting verification decisions for %s items: %s", len(batch), e)
+            return [False] * len(batch)
+        
+        verified = []
+        for item, verification in batch:
+            decision = decisions.get(item.id)
+            if decision is None:
+                # If parsing fails, make a conservative decision
+                verification["verified"] = False
+                verification["confidence"] = 0.2
+                verification["notes"].append("Failed to parse verification decision.")
+            else:
+                verification["verified"] = decision["verified"]
+                verification["confidence"] = decision["confidence"]
+                verification["notes"].append(f"Final assessment: {decision['explanation']}")
+            
+            # Add verification metadata to the item
+            item.verification = verification
+            
+            # Only include verified items in the results
+            verified.append(verification["verified"] and verification["confidence"] >= 0.5)
+        
+        return verified
+    
+    async def _verify_item(self, item: CollectedItem, source_reliability: Dict[str, Any]) -> Optional[CollectedItem]:
+        """
+        Run the automated checks on an item, then get its final decision through the decision batcher.
+        
+        Args:
+            item: The item to verify
+            source_reliability: The result of the source reliability check for the item
+            
+        Returns:
+            The item if it was verified, otherwise None
+        """
+        verification = await self._run_checks(item, source_reliability)
+        if verification is None:
+            return None
+        return item if await self._decision_batcher.submit((item, verification)) else None
+    
+    async def verify(self, query: str, collected_batches: AsyncIterable[List[CollectedItem]], validation_cache: Optional[ValidationCache] = None) -> AsyncIterator[CollectedItem]:
+        """
+        Verify collected OSINT data as it arrives, yielding verified items as they complete.
+        Checks for a batch of collected items start as soon as it arrives, and checked items
+        are coalesced into batched LLM decisions (by size or after a short delay), so
+        collection, checks and decisions all overlap.
+        
+        Args:
+            query: The original user query
+            collected_batches: Batches of data collected by the Collector Agent
+            validation_cache: Cache of source reliability results, e.g. one scoped to a single investigation;
+                defaults to the agent's own short-lived cache
+            
+        Yields:
+            Verified data items, in completion order
+        """
+        logger.info("VerifierAgent: Verifying data for query: %s", query)
+        
+        cache = validation_cache if validation_cache is not None else self._validation_cache
+        batches = aiter(collected_batches)
+        feed = None
+        exhausted = False
+        pending = set()
+        # Filter task -> number of items it was given
+        filters = {}
+        in_flight = 0
+        verified_count = 0
+        
+        try:
+            while True:
+                # Only take the next batch while there is room, so the collector's queue fills up
+                # (and blocks the collector) instead of the checks piling up here
+                if feed is None and not exhausted and in_flight < self._max_in_flight:
+                    feed = asyncio.ensure_future(anext(batches))
+                    pending.add(feed)
+                if not pending:
+                    break
                 
-                # Parse the verification decision (assuming JSON-like format)
-                try:
-                    # Try to find confidence score
-                    confidence_line = [line for line in verification_decision.split("\n") 
-                                     if "confidence" in line.lower()]
-                    if confidence_line:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task is feed:
+                        feed = None
                         try:
-                            confidence_str = confidence_line[0].split(":")[1].strip()
-                            # Remove any trailing characters
-                            confidence_str = ''.join(c for c in confidence_str if c.isdigit() or c in ['.'])
-                            verification["confidence"] = float(confidence_str)
-                        except:
-                            verification["confidence"] = 0.5
-                    
-                    # Try to find verification status
-                    verified_line = [line for line in verification_decision.split("\n") 
-                                   if "verified" in line.lower()]
-                    if verified_line:
-                        verification["verified"] = "verified: true" in verification_decision.lower() or "true" in verified_line[0].lower()
-                    
-                    # Add explanation
-                    explanation_line = [line for line in verification_decision.split("\n") 
-                                      if "explanation" in line.lower()]
-                    if explanation_line and len(explanation_line[0].split(":", 1)) > 1:
-                        verification["notes"].append(f"Final assessment: {explanation_line[0].split(':', 1)[1].strip()}")
-                    elif len(verification_decision.split("\n")) > 0:
-                        first_line = verification_decision.split("\n")[0]
-                        verification["notes"].append(f"Final assessment: {first_line}")
-                except:
-                    # If parsing fails, make a conservative decision
-                    verification["verified"] = False
-                    verification["confidence"] = 0.2
-                    verification["notes"].append("Failed to parse verification decision.")
-                
-                # Add verification metadata to the item
-                item["verification"] = verification
-                
-                # Only include verified items in the results
-                if verification["verified"] and verification["confidence"] >= 0.5:
-                    verified_data.append(item)
-            
-            except Exception as e:
-                logger.error(f"Error verifying item {item.get('id', 'unknown')}: {e}")
+                            collected = task.result()
+                        except StopAsyncIteration:
+                            exhausted = True
+                            continue
+                        in_flight += len(collected)
+                        
+                        # Drop items from unreliable sources before scheduling the expensive checks
+                        filter_task = asyncio.create_task(self._filter_reliable(collected, cache))
+                        filters[filter_task] = len(collected)
+                        pending.add(filter_task)
+                    elif task in filters:
+                        survivors = task.result()
+                        in_flight -= filters.pop(task) - len(survivors)
+                        # Verify the remaining items concurrently
+                        pending.update(
+                            asyncio.create_task(self._verify_item(item, source_reliability))
+                            for item, source_reliability in survivors
+                        )
+                    else:
+                        in_flight -= 1
+                        if task.exception() is None and task.result() is not None:
+                            verified_count += 1
+                            yield task.result()
+        finally:
+            # Don't leave work running if the consumer stops early
+            for task in pending:
+                task.cancel()
         
         # Add verification results to memory
         self.add_to_memory({
             "query": query,
-            "verified_data": verified_data,
-            "verification_count": len(verified_data),
+            "verification_count": verified_count,
             "timestamp": datetime.now().isoformat()
         })
         
-        logger.info(f"VerifierAgent: Finished verifying data for query: {query}")
-        return verified_data 
\ No newline at end of file
+        logger.info("VerifierAgent: Finished verifying data for query: %s", query)
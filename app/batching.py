@@ -0,0 +1,91 @@
+"""
+Asynchronous batching: coalesce individually submitted work items into batches
+that are processed with one call.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Generic, List, Optional, Set, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+class AsyncBatcher(Generic[T, R]):
+    """
+    Collects items submitted by concurrent callers and processes them together.
+    A batch is dispatched once it holds max_size items, or max_delay_ms after its
+    first item arrived, whichever comes first. Each caller gets back its own result.
+    """
+    
+    def __init__(self, max_size: int, max_delay_ms: float, process_batch: Callable[[List[T]], Awaitable[List[Any]]]):
+        """
+        Initialize the batcher.
+        
+        Args:
+            max_size: Dispatch immediately once this many items are pending
+            max_delay_ms: How long to wait for more items before dispatching a partial batch
+            process_batch: Coroutine function that processes a batch and returns one result per item,
+                in order. A result that is an exception is raised to that item's caller.
+        """
+        self.max_size = max_size
+        self.max_delay = max_delay_ms / 1000
+        self.process_batch = process_batch
+        self._pending: List[Tuple[T, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        # Keeps dispatch tasks referenced until they finish, so they can't be garbage collected mid-flight
+        self._dispatch_tasks: Set[asyncio.Task] = set()
+    
+    async def submit(self, item: T) -> R:
+        """
+        Queue an item and wait for its result.
+        
+        Args:
+            item: The item to process
+        
+        Returns:
+            The result for this item
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        
+        if len(self._pending) >= self.max_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_delay, self._flush)
+        
+        return await future
+    
+    def _flush(self) -> None:
+        """Dispatch all pending items as one batch."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._dispatch(batch))
+            self._dispatch_tasks.add(task)
+            task.add_done_callback(self._dispatch_tasks.discard)
+    
+    async def _dispatch(self, batch: List[Tuple[T, asyncio.Future]]) -> None:
+        """Process a batch and resolve its callers' futures."""
+        try:
+            results = await self.process_batch([item for item, _ in batch])
+            if len(results) != len(batch):
+                raise ValueError(f"Batch of {len(batch)} items produced {len(results)} results")
+        except Exception as e:
+            results = [e] * len(batch)
+        except BaseException:
+            # Cancelled (e.g. at loop shutdown): don't leave callers waiting forever
+            for _, future in batch:
+                future.cancel()
+            raise
+        
+        for (_, future), result in zip(batch, results):
+            # Callers that gave up (e.g. were cancelled) no longer need a result
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
@@ -1,28 +1,60 @@
 import os
+import sys
+from dataclasses import dataclass
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
-# Core configuration
+# Core configuration (resolved once at import, read-only afterwards)
+@dataclass(frozen=True, slots=True)
 class Config:
     # API Keys
-    OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
-    BING_API_KEY = os.getenv("BING_API_KEY", "")
-    GOOGLE_GEOCODE_API_KEY = os.getenv("GOOGLE_GEOCODE_API_KEY", "")
+    OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
+    BING_API_KEY: str = os.getenv("BING_API_KEY", "")
+    GOOGLE_GEOCODE_API_KEY: str = os.getenv("GOOGLE_GEOCODE_API_KEY", "")
     
     # LLM settings
-    LLM_MODEL = os.getenv("LLM_MODEL", "gpt-4")
+    LLM_MODEL: str = os.getenv("LLM_MODEL", "gpt-4")
+    LLM_TIMEOUT_S: float = float(os.getenv("LLM_TIMEOUT_S", "60"))
+    # Retries after the first attempt (0 disables retrying)
+    LLM_MAX_RETRIES: int = max(0, int(os.getenv("LLM_MAX_RETRIES", "2")))
     
     # Database
-    DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./data/osint.db")
+    DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./data/osint.db")
     
     # OSINT settings
-    SAVE_MEDIA_PATH = os.getenv("SAVE_MEDIA_PATH", "./data/media")
-    MAX_RESULTS_PER_SOURCE = int(os.getenv("MAX_RESULTS_PER_SOURCE", "10"))
+    SAVE_MEDIA_PATH: str = os.getenv("SAVE_MEDIA_PATH", "./data/media")
+    MAX_RESULTS_PER_SOURCE: int = int(os.getenv("MAX_RESULTS_PER_SOURCE", "10"))
+    # Search the web and news with one combined call per term instead of web search alone
+    COLLECTOR_COMBINED_SEARCH: bool = os.getenv("COLLECTOR_COMBINED_SEARCH", "false").lower() in ("1", "true", "yes")
+    COLLECTOR_MAX_RESULTS_PER_TERM: int = int(os.getenv("COLLECTOR_MAX_RESULTS_PER_TERM", "5"))
+    SOCIAL_SEARCH_CONCURRENCY: int = int(os.getenv("SOCIAL_SEARCH_CONCURRENCY", "6"))
+    SOCIAL_SEARCH_TIMEOUT_S: float = float(os.getenv("SOCIAL_SEARCH_TIMEOUT_S", "15"))
+    MEDIA_DOWNLOAD_TIMEOUT_S: float = float(os.getenv("MEDIA_DOWNLOAD_TIMEOUT_S", "60"))
+    PIPELINE_QUEUE_MAXSIZE: int = int(os.getenv("PIPELINE_QUEUE_MAXSIZE", "256"))
+    WORKFLOW_HISTORY_SIZE: int = int(os.getenv("WORKFLOW_HISTORY_SIZE", "100"))
+    # Scale for the mock tools' simulated delays (0 disables them, e.g. in CI)
+    SIMULATE_LATENCY_SCALE: float = float(os.getenv("SIMULATE_LATENCY_SCALE", "1.0"))
+    MAX_CONCURRENT_DOWNLOADS: int = int(os.getenv("MAX_CONCURRENT_DOWNLOADS", "10"))
+    VERIFIER_MAX_CONCURRENT_IMAGE_CHECKS: int = int(os.getenv("VERIFIER_MAX_CONCURRENT_IMAGE_CHECKS", "8"))
+    VERIFIER_DECISION_BATCH_SIZE: int = int(os.getenv("VERIFIER_DECISION_BATCH_SIZE", "10"))
+    VERIFIER_DECISION_BATCH_DELAY_MS: int = int(os.getenv("VERIFIER_DECISION_BATCH_DELAY_MS", "200"))
+    VERIFIER_MAX_IN_FLIGHT: int = int(os.getenv("VERIFIER_MAX_IN_FLIGHT", "32"))
+    
+    # Cache settings
+    SEARCH_TERMS_CACHE_SIZE: int = int(os.getenv("SEARCH_TERMS_CACHE_SIZE", "1024"))
+    SEARCH_CACHE_SIZE: int = int(os.getenv("SEARCH_CACHE_SIZE", "1024"))
+    SEARCH_CACHE_TTL_S: float = float(os.getenv("SEARCH_CACHE_TTL_S", "300"))
+    VALIDATION_CACHE_SIZE: int = int(os.getenv("VALIDATION_CACHE_SIZE", "128"))
+    VERIFIER_CACHE_TTL_S: float = float(os.getenv("VERIFIER_CACHE_TTL_S", "300"))
+    VERIFIER_RESULT_CACHE_PATH: str = os.getenv("VERIFIER_RESULT_CACHE_PATH", "./data/verifier_cache.db")
+    VERIFIER_RESULT_CACHE_TTL_S: float = float(os.getenv("VERIFIER_RESULT_CACHE_TTL_S", "86400"))
     
     # Agent settings
-    COLLECTOR_PROMPT_TEMPLATE = """
+    AGENT_MEMORY_MAX: int = int(os.getenv("AGENT_MEMORY_MAX", "128"))
+    
+    COLLECTOR_PROMPT_TEMPLATE: str = sys.intern("""
     You are a Collector Agent in a CAMEL-based OSINT system. Your role is to gather information from 
     open sources based on the user's query. Collect relevant data from web searches, social media,
     satellite imagery, and reports. Focus specifically on:
@@ -35,9 +67,9 @@ class Config:
     User Query: {user_query}
     
     Provide a comprehensive list of findings with sources. Be objective and thorough.
-    """
+    """)
     
-    VERIFICATION_PROMPT_TEMPLATE = """
+    VERIFICATION_PROMPT_TEMPLATE: str = sys.intern("""
     You are a Verification Agent in a CAMEL-based OSINT system. Your role is to verify the information
     collected by the Collector Agent. For each item:
     
@@ -51,9 +83,9 @@ class Config:
     
     User Query: {user_query}
     Collected Data: {collected_data}
-    """
+    """)
     
-    REPORT_PROMPT_TEMPLATE = """
+    REPORT_PROMPT_TEMPLATE: str = sys.intern("""
     You are a Report Writer Agent in a CAMEL-based OSINT system. Your role is to compile the verified
     information into a coherent report that addresses the user's query. The report should:
     
@@ -65,9 +97,9 @@ class Config:
     
     User Query: {user_query}
     Verified Data: {verified_data}
-    """
+    """)
     
-    ETHICAL_FILTER_PROMPT_TEMPLATE = """
+    ETHICAL_FILTER_PROMPT_TEMPLATE: str = sys.intern("""
     You are an Ethical Filter Agent in a CAMEL-based OSINT system. Your role is to review the draft
     report for ethical concerns and compliance issues. Check for:
     
@@ -80,6 +112,6 @@ class Config:
     Make necessary adjustments to ensure the report is ethical and responsible.
     
     Draft Report: {draft_report}
-    """
+    """)
 
 config = Config() 
\ No newline at end of file
@@ -1,25 +1,26 @@
 import sys
 import os
 import asyncio
-import json
 import websockets
+import qasync
 from datetime import datetime
-from threading import Thread
 
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QTextEdit, QLineEdit, QLabel, QTabWidget,
     QSplitter, QGroupBox, QStatusBar, QProgressBar
 )
-from PySide6.QtCore import Qt, QObject, Signal, Slot, QUrl
+from PySide6.QtCore import Qt, QObject, Signal, Slot, QUrl, QTimer
 from PySide6.QtGui import QIcon, QFont, QTextCursor, QDesktopServices
 from app.logging_config import logger
+from app.serialization import dumps, loads
 
 class WebSocketThread(QObject):
-    """Thread to handle WebSocket communication."""
-    message_received = Signal(str)
+    """Handles WebSocket communication on the GUI's asyncio loop."""
+    message_received = Signal(object)
     status_update = Signal(str)
     report_received = Signal(str)
+    report_partial = Signal(str)
     connection_error = Signal(str)
     
     def __init__(self, url):
@@ -31,22 +32,31 @@ class WebSocketThread(QObject):
     async def connect(self):
         """Connect to the WebSocket server."""
         try:
-            self.websocket = await websockets.connect(self.url)
+            # Negotiate permessage-deflate; report frames are large, highly compressible text
+            self.websocket = await websockets.connect(self.url, compression="deflate")
             self.running = True
             self.status_update.emit("Connected to OSINT server")
             
             # Listen for messages
             while self.running:
                 message = await self.websocket.recv()
-                data = json.loads(message)
                 
-                if "status" in data:
-                    self.status_update.emit(data["status"])
-                
-                if "report" in data:
-                    self.report_received.emit(data["report"])
-                
-                self.message_received.emit(message)
+                # The server coalesces queued updates into one JSON array per frame
+                for data in loads(message):
+                    status = data.get("status")
+                    if status is not None:
+                        self.status_update.emit(status)
+                    
+                    partial = data.get("partial")
+                    if partial is not None:
+                        self.report_partial.emit(partial)
+                    
+                    report = data.get("report")
+                    if report is not None:
+                        self.report_received.emit(report)
+                    
+                    # Emit the decoded message so receivers don't parse it again
+                    self.message_received.emit(data)
                 
         except Exception as e:
             self.connection_error.emit(f"WebSocket error: {str(e)}")
@@ -72,12 +82,13 @@ class OsintGUI(QMainWindow):
         self.setWindowTitle("OSINT Analysis System")
         self.setMinimumSize(1000, 700)
         
-        # WebSocket thread
+        # WebSocket client (runs on the Qt-integrated asyncio loop)
         self.ws_thread = None
         self.ws_url = "ws://localhost:8000/ws"
         
-        # Create the event loop for asyncio
-        self.loop = asyncio.new_event_loop()
+        # Status lines waiting to be flushed to the status log in one append
+        self._pending_status: list[str] = []
+        self._flush_scheduled = False
         
         # Initialize UI
         self.init_ui()
@@ -149,6 +160,7 @@ class OsintGUI(QMainWindow):
         # Status tab
         self.status_tab = QTextEdit()
         self.status_tab.setReadOnly(True)
+        self.status_tab.document().setMaximumBlockCount(5000)
         self.tabs.addTab(self.status_tab, "Status Log")
         
         # Sources tab (for future implementation)
@@ -187,18 +199,12 @@ class OsintGUI(QMainWindow):
         
         # Connect signals
         self.ws_thread.status_update.connect(self.update_status)
+        self.ws_thread.report_partial.connect(self.append_report_preview)
         self.ws_thread.report_received.connect(self.display_report)
         self.ws_thread.connection_error.connect(self.handle_connection_error)
         
-        # Start the thread
-        self.asyncio_thread = Thread(target=self.run_asyncio_loop)
-        self.asyncio_thread.daemon = True
-        self.asyncio_thread.start()
-    
-    def run_asyncio_loop(self):
-        """Run the asyncio event loop in a separate thread."""
-        asyncio.set_event_loop(self.loop)
-        self.loop.run_until_complete(self.ws_thread.connect())
+        # Run the connection on the Qt-integrated asyncio loop
+        asyncio.ensure_future(self.ws_thread.connect())
     
     @Slot()
     def submit_query(self):
@@ -207,11 +213,12 @@ class OsintGUI(QMainWindow):
         if not query:
             self.status_message.setText("Please enter a query")
             return
-        logger.info(f"User submitted query via GUI: {query}")
+        logger.info("User submitted query via GUI: %s", query)
         
         # Clear previous results
         self.report_tab.clear()
         self.status_tab.clear()
+        self._pending_status.clear()
         
         # Update UI
         self.status_message.setText("Processing query...")
@@ -224,34 +231,59 @@ class OsintGUI(QMainWindow):
         self.status_tab.append(status_text)
         
         # Send query to server
-        query_data = json.dumps({"query": query})
-        asyncio.run_coroutine_threadsafe(self.ws_thread.send_message(query_data), self.loop)
+        query_data = dumps({"query": query})
+        asyncio.ensure_future(self.ws_thread.send_message(query_data))
     
     @Slot(str)
     def update_status(self, status):
         """Update the status log with a new status message."""
         timestamp = datetime.now().strftime("%H:%M:%S")
         status_text = f"[{timestamp}] {status}\n"
-        self.status_tab.append(status_text)
+        self._pending_status.append(status_text)
+        if not self._flush_scheduled:
+            # Coalesce bursts of status messages into a single append
+            self._flush_scheduled = True
+            QTimer.singleShot(50, self._flush_status)
         self.status_message.setText(status)
         
-        # Update progress bar based on status messages
+        # Update progress bar based on status messages. Pipeline stages overlap,
+        # so their messages can arrive out of order; progress only moves forward.
         if "Starting data collection" in status:
-            self.progress_bar.setValue(20)
+            self._advance_progress(20)
         elif "Collection complete" in status:
-            self.progress_bar.setValue(40)
+            self._advance_progress(40)
         elif "Starting verification" in status:
-            self.progress_bar.setValue(50)
+            self._advance_progress(50)
         elif "Verification complete" in status:
-            self.progress_bar.setValue(70)
+            self._advance_progress(70)
         elif "Generating report" in status:
-            self.progress_bar.setValue(80)
+            self._advance_progress(80)
         elif "Applying ethical filter" in status:
-            self.progress_bar.setValue(90)
+            self._advance_progress(90)
         elif "Report complete" in status:
-            self.progress_bar.setValue(100)
+            self._advance_progress(100)
             self.submit_button.setEnabled(True)
     
+    def _advance_progress(self, value):
+        """Move the progress bar forward to value, never backwards."""
+        if value > self.progress_bar.value():
+            self.progress_bar.setValue(value)
+    
+    def _flush_status(self):
+        """Append all pending status lines to the status log at once."""
+        self._flush_scheduled = False
+        if not self._pending_status:
+            return
+        self.status_tab.append("\n".join(self._pending_status))
+        self._pending_status.clear()
+    
+    @Slot(str)
+    def append_report_preview(self, chunk):
+        """Append a paragraph of the draft report as it streams in; the final report replaces it."""
+        cursor = self.report_tab.textCursor()
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(chunk)
+    
     @Slot(str)
     def display_report(self, report):
         """Display the final report."""
@@ -281,17 +313,44 @@ class OsintGUI(QMainWindow):
         """Handle the window close event."""
         # Close the WebSocket connection
         if self.ws_thread and self.ws_thread.running:
-            asyncio.run_coroutine_threadsafe(self.ws_thread.close(), self.loop)
+            asyncio.ensure_future(self.ws_thread.close())
         
         # Accept the close event
         event.accept()
 
-def main():
-    """Main entry point for the application."""
+async def _wait_until_serving(server, server_task):
+    """Wait until the API server is accepting connections (or has failed to start)."""
+    while not server.started and not server_task.done():
+        await asyncio.sleep(0.05)
+
+def main(server=None):
+    """
+    Main entry point for the application.
+    
+    Args:
+        server: Optional uvicorn.Server to host on the GUI's event loop; the window opens
+            once it is accepting connections, and it is shut down when the GUI exits
+    """
     app = QApplication(sys.argv)
-    window = OsintGUI()
-    window.show()
-    sys.exit(app.exec())
+    
+    # Run asyncio on top of the Qt event loop so WebSocket I/O and UI updates share one thread
+    loop = qasync.QEventLoop(app)
+    asyncio.set_event_loop(loop)
+    
+    with loop:
+        server_task = None
+        if server is not None:
+            server_task = loop.create_task(server.serve())
+            loop.run_until_complete(_wait_until_serving(server, server_task))
+        
+        window = OsintGUI()
+        window.show()
+        
+        loop.run_forever()
+        
+        if server_task is not None:
+            server.should_exit = True
+            loop.run_until_complete(server_task)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,59 @@
+"""
+The HTTP clients shared by all agents and tools: the aiohttp session for plain
+HTTP requests and the OpenAI client.
+"""
+
+from typing import Optional
+
+import aiohttp
+import httpx
+import openai
+
+from app.config.config import config
+
+_http_session: Optional[aiohttp.ClientSession] = None
+_openai_client: Optional[openai.AsyncOpenAI] = None
+
+def get_http_session() -> aiohttp.ClientSession:
+    """
+    Get the shared aiohttp session, creating it on first use.
+    Sharing one session lets tools reuse pooled keep-alive connections (and their
+    TCP and TLS handshakes) and cached DNS lookups across requests.
+    Must be called from a running event loop.
+    
+    Returns:
+        The shared aiohttp session
+    """
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        _http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=64, ttl_dns_cache=300)
+        )
+    return _http_session
+
+async def close_http_session() -> None:
+    """Close the shared aiohttp session, if one was created."""
+    global _http_session
+    if _http_session is not None:
+        await _http_session.close()
+        _http_session = None
+
+def get_openai_client() -> openai.AsyncOpenAI:
+    """
+    Get the AsyncOpenAI client shared by all agents and tools, creating it on first use.
+    Sharing one client lets them reuse the same pool of keep-alive connections.
+    
+    Returns:
+        The shared AsyncOpenAI client
+    """
+    global _openai_client
+    if _openai_client is None:
+        _openai_client = openai.AsyncOpenAI(
+            api_key=config.OPENAI_API_KEY,
+            # Timeouts and retries are handled per request by BaseAgent._with_retries
+            max_retries=0,
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=50)
+            )
+        )
+    return _openai_client
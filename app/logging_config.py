@@ -1,29 +1,65 @@
+import atexit
 import logging
+import queue
 from logging import StreamHandler
-from colorama import init, Fore, Style
+from logging.handlers import QueueHandler, QueueListener
 
-# Initialize colorama for cross-platform colored output
-init(autoreset=True)
+try:
+    from colorama import init
+    # Initialize colorama for cross-platform colored output. The formatter emits its
+    # own reset sequence, so colorama doesn't need to append another one per write.
+    init(autoreset=False)
+except ImportError:  # colorama only translates ANSI codes for old Windows consoles
+    init = None
+
+RESET = "\x1b[0m"
 
 class ColorFormatter(logging.Formatter):
+    # ANSI color sequence for each level
     COLORS = {
-        logging.DEBUG: Fore.CYAN,
-        logging.INFO: Fore.GREEN,
-        logging.WARNING: Fore.YELLOW,
-        logging.ERROR: Fore.RED,
-        logging.CRITICAL: Fore.MAGENTA + Style.BRIGHT,
+        logging.DEBUG: "\x1b[36m",
+        logging.INFO: "\x1b[32m",
+        logging.WARNING: "\x1b[33m",
+        logging.ERROR: "\x1b[31m",
+        logging.CRITICAL: "\x1b[35m\x1b[1m",
     }
+    
+    def __init__(self, fmt=None, datefmt=None, use_color=True):
+        super().__init__(fmt, datefmt)
+        # One formatter per level with its color and reset sequences baked into the format
+        # string, so records are colored without being mutated (other handlers still see
+        # the original record); unknown levels, and everything when color is off, are uncolored
+        self._level_formatters = {}
+        if use_color:
+            for level, color in self.COLORS.items():
+                level_fmt = (self._fmt
+                    .replace("%(levelname)s", f"{color}%(levelname)s{RESET}")
+                    .replace("%(message)s", f"{color}%(message)s{RESET}"))
+                self._level_formatters[level] = logging.Formatter(level_fmt, datefmt)
+    
     def format(self, record):
-        color = self.COLORS.get(record.levelno, "")
-        reset = Style.RESET_ALL
-        record.levelname = f"{color}{record.levelname}{reset}"
-        record.msg = f"{color}{record.msg}{reset}"
-        return super().format(record)
+        formatter = self._level_formatters.get(record.levelno)
+        if formatter is None:
+            return super().format(record)
+        return formatter.format(record)
 
 logger = logging.getLogger("osint")
 logger.setLevel(logging.DEBUG)
 handler = StreamHandler()
-formatter = ColorFormatter('[%(asctime)s] %(levelname)s: %(message)s', "%Y-%m-%d %H:%M:%S")
+# Only color output going to a terminal, not redirected logs
+formatter = ColorFormatter(
+    '[%(asctime)s] %(levelname)s: %(message)s',
+    "%Y-%m-%d %H:%M:%S",
+    use_color=handler.stream.isatty()
+)
 handler.setFormatter(formatter)
+
+# Log calls only enqueue records; a background listener thread does the
+# terminal I/O so logging never blocks the asyncio event loop
+log_queue = queue.SimpleQueue()
+listener = QueueListener(log_queue, handler)
+listener.start()
+atexit.register(listener.stop)
+
 logger.handlers = []
-logger.addHandler(handler) 
\ No newline at end of file
+logger.addHandler(QueueHandler(log_queue)) 
\ No newline at end of file
@@ -0,0 +1,85 @@
+"""
+Data records passed between agents.
+"""
+
+import asyncio
+import uuid
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional
+
+@dataclass(slots=True)
+class CollectedItem:
+    """
+    A single piece of OSINT data collected from a web or social media source.
+    Slotted to keep per-item memory small when a query collects hundreds of results.
+    """
+    id: str
+    source: str
+    source_name: str
+    url: str
+    title: str = ""
+    content: str = ""
+    timestamp: str = ""
+    search_term: str = ""
+    user: Optional[str] = None
+    media_path: Optional[str] = None
+    media_metadata: Dict[str, Any] = field(default_factory=dict)
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    
+    # Set by the Verifier Agent
+    verified_location: Optional[str] = None
+    verification: Optional[Dict[str, Any]] = None
+
+@dataclass(frozen=True, slots=True)
+class SocialPost:
+    """
+    A normalized social media post returned by social_media_search.
+    Slotted and immutable: searches can return hundreds of posts, and cached
+    results are shared between callers.
+    """
+    platform: Optional[str]
+    user: Optional[str]
+    url: Optional[str]
+    text: Optional[str]
+    date: Optional[str]
+    media_url: Optional[str]
+    likes: int = 0
+    shares: int = 0
+    comments: int = 0
+    sentiment: Optional[str] = None
+    type: Optional[str] = None
+    lang: Optional[str] = None
+
+@dataclass(slots=True, eq=False)
+class WorkflowContext:
+    """
+    The state of one query's run through the agent workflow. Each query gets its
+    own context, so concurrent queries never share mutable state. Contexts compare
+    by identity.
+    """
+    query: str
+    query_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    collected_data: List[CollectedItem] = field(default_factory=list)
+    verified_data: List[CollectedItem] = field(default_factory=list)
+    draft_report: str = ""
+    final_report: str = ""
+    
+    # Pipeline backpressure state
+    collected_queue: Optional[asyncio.Queue] = None
+    queue_pressure: bool = False
+    pressure_since: Optional[float] = None
+    
+    def get_workflow_state(self) -> Dict[str, Any]:
+        """Get the current state of the workflow."""
+        queue = self.collected_queue
+        return {
+            "query_id": self.query_id,
+            "query": self.query,
+            "collection_status": len(self.collected_data),
+            "verification_status": len(self.verified_data),
+            "report_status": bool(self.draft_report),
+            "complete": bool(self.final_report),
+            "queue_depth": queue.qsize() if queue is not None else 0,
+            "queue_maxsize": queue.maxsize if queue is not None else 0,
+            "queue_pressure": self.queue_pressure
+        }
@@ -1,19 +1,45 @@
 import os
 import json
-from typing import Dict, List, Any, Optional
+from typing import List, AsyncIterator, Callable, Optional, Set
 import asyncio
+import hashlib
+import time
 
 from app.config.config import config
-from app.agents.collector import CollectorAgent
+from app.agents.collector import CollectorAgent, canonical_url
 from app.agents.verifier import VerifierAgent
 from app.agents.reporter import ReporterAgent
 from app.agents.ethical_filter import EthicalFilterAgent
 from app.logging_config import logger
+from app.models import CollectedItem, WorkflowContext
+from app.validation_cache import ValidationCache
+
+def _canonical_key(item: CollectedItem) -> Optional[bytes]:
+    """
+    Identify a collected item for cross-source de-duplication: by canonical URL,
+    or by title and content for items without a URL.
+    
+    Args:
+        item: The collected item
+        
+    Returns:
+        A short digest identifying the item, or None if it has nothing to identify it by
+        (e.g. web search answers without a URL), in which case it is never a duplicate
+    """
+    if item.url:
+        identity = canonical_url(item.url)
+    elif item.title or item.content:
+        identity = f"{item.title}\x00{item.content}"
+    else:
+        return None
+    return hashlib.blake2b(identity.encode("utf-8"), digest_size=8).digest()
 
 class Orchestrator:
     """
     The main orchestrator that manages the CAMEL agent workflow.
     Coordinates communication between agents and handles the data flow.
+    Per-query state lives in a WorkflowContext, so one orchestrator can run
+    any number of queries concurrently.
     """
     
     def __init__(self):
@@ -26,94 +52,248 @@ class Orchestrator:
         # Create data directories if they don't exist
         os.makedirs(config.SAVE_MEDIA_PATH, exist_ok=True)
         
-        # Workflow state
-        self.current_query = ""
-        self.collected_data = []
-        self.verified_data = []
-        self.draft_report = ""
-        self.final_report = ""
+        # Workflows currently in progress, checked for backpressure
+        self._active: Set[WorkflowContext] = set()
         
-    async def process_query(self, query: str, callback=None) -> str:
+    async def process_query(self, query: str, callback=None, ctx: Optional[WorkflowContext] = None,
+                            on_partial: Optional[Callable[[str], None]] = None) -> WorkflowContext:
         """
         Process a user query through the entire CAMEL agent workflow.
+        Collection and verification run as a pipeline: items are verified
+        while later sources are still being collected.
         
         Args:
             query: The user's OSINT query
             callback: Optional callback function to receive status updates
+            ctx: Optional context to record the workflow state in, e.g. so callers
+                can report progress while the query runs; a new one is created by default
+            on_partial: Optional callback receiving a live preview of the draft report,
+                one screened paragraph at a time, while it is generated
             
         Returns:
-            The final report as a string
+            The workflow context, holding the final report
         """
-        self.current_query = query
-        logger.info(f"Processing query: {query}")
+        if ctx is None:
+            ctx = WorkflowContext(query)
+        logger.info("Processing query %s: %s", ctx.query_id, query)
         
-        # Step 1: Collection
-        if callback:
-            await callback("Starting data collection...")
-        logger.info("Invoking CollectorAgent for data collection.")
-        self.collected_data = await self.collector_agent.collect(query)
-        logger.info(f"CollectorAgent collected {len(self.collected_data)} items.")
-        if callback:
-            await callback(f"Collection complete. Found {len(self.collected_data)} items.")
-        
-        # Step 2: Verification
-        if callback:
-            await callback("Starting verification process...")
-        logger.info("Invoking VerifierAgent for data verification.")
-        self.verified_data = await self.verifier_agent.verify(
-            query, self.collected_data
-        )
-        logger.info(f"VerifierAgent verified {len(self.verified_data)} items.")
-        if callback:
-            await callback(f"Verification complete. {len(self.verified_data)} items verified.")
-        
-        # Step 3: Report writing
-        if callback:
-            await callback("Generating report...")
-        logger.info("Invoking ReporterAgent to generate report.")
-        self.draft_report = await self.reporter_agent.generate_report(
-            query, self.verified_data
-        )
-        logger.info("ReporterAgent generated draft report.")
-        
-        # Step 4: Ethical filtering
-        if callback:
-            await callback("Applying ethical filter...")
-        logger.info("Invoking EthicalFilterAgent for ethical filtering.")
-        self.final_report = await self.ethical_filter_agent.filter(
-            self.draft_report
-        )
-        logger.info("EthicalFilterAgent produced final report.")
-        if callback:
-            await callback("Report complete.")
-        
-        return self.final_report
+        # Status updates go through a queue, so a slow callback (e.g. a WebSocket
+        # write) never holds up the pipeline stages
+        status_queue = asyncio.Queue()
+        notify = status_queue.put_nowait
+        publisher_task = asyncio.create_task(self._publish_status(status_queue, callback))
+        
+        try:
+            # Steps 1 and 2: Collection feeding verification through a bounded queue,
+            # so a lagging verifier holds back collection instead of growing memory
+            ctx.collected_queue = asyncio.Queue(maxsize=config.PIPELINE_QUEUE_MAXSIZE)
+            self._active.add(ctx)
+            stages = [
+                asyncio.create_task(self._run_collection(ctx, notify)),
+                asyncio.create_task(self._run_verification(ctx, notify))
+            ]
+            try:
+                await asyncio.gather(*stages)
+            except BaseException:
+                # If one stage fails, don't leave the other blocked on the queue
+                for stage in stages:
+                    stage.cancel()
+                raise
+            finally:
+                self._active.discard(ctx)
+            
+            # Step 3: Report writing (needs the full verified set for its summary)
+            notify("Generating report...")
+            logger.info("Invoking ReporterAgent to generate report.")
+            if on_partial is None:
+                ctx.draft_report = await self.reporter_agent.generate_report(
+                    query, ctx.verified_data
+                )
+            else:
+                ctx.draft_report = await self._stream_report(ctx, on_partial)
+            logger.info("ReporterAgent generated draft report.")
+            
+            # Step 4: Ethical filtering
+            notify("Applying ethical filter...")
+            logger.info("Invoking EthicalFilterAgent for ethical filtering.")
+            ctx.final_report = await self.ethical_filter_agent.filter(
+                ctx.draft_report
+            )
+            logger.info("EthicalFilterAgent produced final report.")
+            notify("Report complete.")
+        finally:
+            # Deliver any remaining status updates before returning
+            notify(None)
+            await publisher_task
+        
+        return ctx
     
-    def get_workflow_state(self) -> Dict[str, Any]:
-        """Get the current state of the workflow."""
-        return {
-            "query": self.current_query,
-            "collection_status": len(self.collected_data),
-            "verification_status": len(self.verified_data),
-            "report_status": bool(self.draft_report),
-            "complete": bool(self.final_report)
-        }
+    async def _publish_status(self, status_queue: asyncio.Queue, callback=None) -> None:
+        """
+        Deliver queued status updates to the callback, in order, until a None sentinel arrives.
+        
+        Args:
+            status_queue: Queue of status messages
+            callback: Optional callback function to receive status updates
+        """
+        while (status := await status_queue.get()) is not None:
+            if callback:
+                try:
+                    await callback(status)
+                except Exception as e:
+                    logger.warning("Status callback failed: %s", e)
+    
+    async def _stream_report(self, ctx: WorkflowContext, on_partial: Callable[[str], None]) -> str:
+        """
+        Report stage with a live preview: each paragraph of the draft is passed on as soon
+        as it is complete, after a PII screen, while the rest is still being generated.
+        
+        Args:
+            ctx: The workflow context
+            on_partial: Receives each screened paragraph of the draft
+            
+        Returns:
+            The draft report
+        """
+        paragraphs = asyncio.Queue()
+        pending = ""
+        
+        def on_delta(delta: str) -> None:
+            nonlocal pending
+            pending += delta
+            while "\n\n" in pending:
+                paragraph, pending = pending.split("\n\n", 1)
+                paragraphs.put_nowait(paragraph + "\n\n")
+        
+        async def forward() -> None:
+            while (paragraph := await paragraphs.get()) is not None:
+                on_partial(await self.ethical_filter_agent.screen(paragraph))
+        
+        forwarder = asyncio.create_task(forward())
+        try:
+            draft_report = await self.reporter_agent.generate_report(
+                ctx.query, ctx.verified_data, on_delta
+            )
+            if pending:
+                paragraphs.put_nowait(pending)
+            paragraphs.put_nowait(None)
+            await forwarder
+        finally:
+            forwarder.cancel()
+        return draft_report
     
-    def get_collected_data(self) -> List[Dict[str, Any]]:
-        """Get the collected data items."""
-        return self.collected_data
+    async def _run_collection(self, ctx: WorkflowContext, notify: Callable[[Optional[str]], None]) -> None:
+        """
+        Collection stage: put each collected item on the context's queue as it arrives,
+        skipping items another source already returned so verification never repeats work.
+        
+        Args:
+            ctx: The workflow context; its queue feeds the verification stage and is closed with None
+            notify: Publishes a status update
+        """
+        notify("Starting data collection...")
+        logger.info("Invoking CollectorAgent for data collection.")
+        collected_queue = ctx.collected_queue
+        
+        # Soft backpressure: collect less while verification is persistently behind for any query
+        max_results = config.COLLECTOR_MAX_RESULTS_PER_TERM
+        if any(active.queue_pressure for active in self._active):
+            max_results = max(1, max_results // 2)
+            logger.warning("queue_pressure=True: collecting at most %s results per search term", max_results)
+        
+        seen = set()
+        duplicates = 0
+        async for items in self.collector_agent.collect_stream(ctx.query, max_results):
+            for item in items:
+                key = _canonical_key(item)
+                if key is not None:
+                    if key in seen:
+                        duplicates += 1
+                        continue
+                    seen.add(key)
+                ctx.collected_data.append(item)
+                await self._put_collected(ctx, item)
+        await collected_queue.put(None)
+        logger.info("CollectorAgent collected %s items (%s duplicates dropped).", len(ctx.collected_data), duplicates)
+        notify(f"Collection complete. Found {len(ctx.collected_data)} items.")
     
-    def get_verified_data(self) -> List[Dict[str, Any]]:
-        """Get the verified data items."""
-        return self.verified_data
+    async def _put_collected(self, ctx: WorkflowContext, item: CollectedItem) -> None:
+        """
+        Put a collected item on the context's queue, blocking while the queue is full.
+        Queue pressure keeps being tracked while blocked, since nothing else updates it then.
+        
+        Args:
+            ctx: The workflow context
+            item: The collected item
+        """
+        collected_queue = ctx.collected_queue
+        if not collected_queue.full():
+            collected_queue.put_nowait(item)
+            self._track_queue_pressure(ctx)
+            return
+        
+        put = asyncio.ensure_future(collected_queue.put(item))
+        try:
+            while not put.done():
+                await asyncio.wait({put}, timeout=0.25)
+                self._track_queue_pressure(ctx)
+        finally:
+            put.cancel()
     
-    def get_draft_report(self) -> str:
-        """Get the draft report."""
-        return self.draft_report
+    async def _run_verification(self, ctx: WorkflowContext, notify: Callable[[Optional[str]], None]) -> None:
+        """
+        Verification stage: verify collected items as they come off the context's queue.
+        
+        Args:
+            ctx: The workflow context; its queue of collected items is closed with None
+            notify: Publishes a status update
+        """
+        notify("Starting verification process...")
+        logger.info("Invoking VerifierAgent for data verification.")
+        collected_queue = ctx.collected_queue
+        
+        async def collected_batches() -> AsyncIterator[List[CollectedItem]]:
+            while True:
+                # Take everything already queued as one batch, so reliability checks run in bulk
+                items = [await collected_queue.get()]
+                while items[-1] is not None and not collected_queue.empty():
+                    items.append(collected_queue.get_nowait())
+                self._track_queue_pressure(ctx)
+                
+                finished = items[-1] is None
+                if finished:
+                    items.pop()
+                if items:
+                    yield items
+                if finished:
+                    return
+        
+        # Tool results are shared between items of this investigation only
+        validation_cache = ValidationCache(config.VALIDATION_CACHE_SIZE)
+        async for item in self.verifier_agent.verify(ctx.query, collected_batches(), validation_cache):
+            ctx.verified_data.append(item)
+            notify(f"Verified {len(ctx.verified_data)}/{len(ctx.collected_data)} items...")
+        logger.info("VerifierAgent verified %s items.", len(ctx.verified_data))
+        notify(f"Verification complete. {len(ctx.verified_data)} items verified.")
     
-    def get_final_report(self) -> str:
-        """Get the final report."""
-        return self.final_report
-
-# Singleton instance
-orchestrator = Orchestrator() 
\ No newline at end of file
+    def _track_queue_pressure(self, ctx: WorkflowContext) -> None:
+        """
+        Update a workflow's backpressure flag: the pipeline is under pressure once its
+        queue has stayed above 75% of its capacity for more than a second.
+        
+        Args:
+            ctx: The workflow context whose inter-stage queue to check
+        """
+        queue = ctx.collected_queue
+        if queue.qsize() > queue.maxsize * 0.75:
+            now = time.monotonic()
+            if ctx.pressure_since is None:
+                ctx.pressure_since = now
+            elif not ctx.queue_pressure and now - ctx.pressure_since > 1.0:
+                ctx.queue_pressure = True
+                logger.warning("queue_pressure=True: verification queue at %s/%s", queue.qsize(), queue.maxsize)
+        else:
+            if ctx.queue_pressure:
+                logger.info("queue_pressure=False: verification queue at %s/%s", queue.qsize(), queue.maxsize)
+            ctx.pressure_since = None
+            ctx.queue_pressure = False
@@ -0,0 +1,65 @@
+"""
+JSON helpers that use orjson when it is installed and fall back to the stdlib json module.
+"""
+
+import dataclasses
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # orjson is optional
+    orjson = None
+
+def _default(obj: Any) -> Any:
+    """Convert dataclass instances for the stdlib encoder (orjson handles them natively)."""
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dumps(obj: Any, indent: bool = False) -> str:
+    """
+    Serialize an object to a JSON string.
+    
+    Args:
+        obj: The object to serialize
+        indent: Pretty-print with a two-space indent
+        
+    Returns:
+        The JSON string
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option).decode("utf-8")
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False, default=_default)
+
+def dumpb(obj: Any) -> bytes:
+    """
+    Serialize an object to UTF-8 encoded JSON bytes, e.g. for binary WebSocket frames.
+    With orjson this skips decoding to str and re-encoding.
+    
+    Args:
+        obj: The object to serialize
+        
+    Returns:
+        The JSON document as bytes
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, default=_default).encode("utf-8")
+
+def loads(data: Any) -> Any:
+    """
+    Deserialize a JSON string or bytes.
+    
+    Args:
+        data: The JSON document
+        
+    Returns:
+        The deserialized object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
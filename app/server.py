@@ -1,6 +1,6 @@
 import os
-import json
-from typing import Dict, List, Any, Optional
+import importlib.util
+from typing import Dict, Any, Optional, Set
 import asyncio
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, BackgroundTasks, HTTPException
@@ -8,14 +8,19 @@ from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 import uvicorn
 
-from app.orchestrator import orchestrator
+from app.config.config import config
+from app.models import WorkflowContext
+from app.orchestrator import Orchestrator
+from app.http_session import get_http_session, close_http_session
 from app.logging_config import logger
+from app.serialization import dumpb, loads
 
 # Define API models
 class OsintQuery(BaseModel):
     query: str
     
 class OsintResponse(BaseModel):
+    query_id: str
     query: str
     report: str
     
@@ -39,12 +44,66 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+async def open_http():
+    """Create the HTTP session shared by the tools for the lifetime of the server."""
+    app.state.http = get_http_session()
+
+@app.on_event("startup")
+async def create_orchestrator():
+    """Create the orchestrator and the registry of submitted workflows, keyed by query ID."""
+    app.state.orchestrator = Orchestrator()
+    app.state.workflows = {}
+
+def register_workflow(ctx: WorkflowContext) -> None:
+    """Track a workflow for /status and /report, forgetting the oldest beyond the history size."""
+    workflows = app.state.workflows
+    workflows[ctx.query_id] = ctx
+    while len(workflows) > config.WORKFLOW_HISTORY_SIZE:
+        del workflows[next(iter(workflows))]
+
+def get_workflow(query_id: str) -> WorkflowContext:
+    """Look up a submitted workflow, or fail with 404."""
+    ctx = app.state.workflows.get(query_id)
+    if ctx is None:
+        raise HTTPException(status_code=404, detail="Unknown query ID")
+    return ctx
+
+@app.on_event("shutdown")
+async def close_http():
+    """Close the shared HTTP session."""
+    await close_http_session()
+
 # Active WebSocket connections
-active_connections: List[WebSocket] = []
+active_connections: Set[WebSocket] = set()
+
+async def send_updates(websocket: WebSocket, outgoing: asyncio.Queue):
+    """
+    Send queued updates to a connected client. Every update already waiting in the
+    queue is coalesced into one frame, so bursts of status messages cost one send.
+    Frames are binary, UTF-8 encoded JSON arrays of update objects.
+    """
+    while True:
+        updates = [await outgoing.get()]
+        while True:
+            try:
+                updates.append(outgoing.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        await websocket.send_bytes(dumpb(updates))
+        for _ in updates:
+            outgoing.task_done()
 
-async def update_client(websocket: WebSocket, message: str):
-    """Send a status update to a connected client."""
-    await websocket.send_text(json.dumps({"status": message}))
+async def flush_updates(outgoing: asyncio.Queue, writer_task: asyncio.Task, timeout: float = 5.0):
+    """
+    Wait until the writer has sent every queued update, or has stopped (e.g. the socket
+    closed), or the timeout has passed.
+    """
+    drained = asyncio.ensure_future(outgoing.join())
+    try:
+        await asyncio.wait({drained, writer_task}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        drained.cancel()
 
 @app.get("/")
 async def root():
@@ -56,72 +115,98 @@ async def process_query(query: OsintQuery, background_tasks: BackgroundTasks):
     """
     Process an OSINT query synchronously.
     This will return a 202 Accepted response and process the query in the background.
-    Check /status for updates.
+    Check /status/{query_id} for updates.
     """
-    logger.info(f"Received user query: {query.query}")
+    logger.info("Received user query: %s", query.query)
+    ctx = WorkflowContext(query.query)
+    register_workflow(ctx)
     # Start the query processing in the background
-    background_tasks.add_task(orchestrator.process_query, query.query)
-    logger.info("Started background task for query processing.")
+    background_tasks.add_task(app.state.orchestrator.process_query, query.query, None, ctx)
+    logger.info("Started background task for query %s.", ctx.query_id)
     # Return a response immediately
     return {
+        "query_id": ctx.query_id,
         "query": query.query,
-        "report": "Processing query in the background. Check /status for updates."
+        "report": f"Processing query in the background. Check /status/{ctx.query_id} for updates."
     }
 
-@app.get("/status")
-async def get_status():
-    """Get the current workflow status."""
-    return orchestrator.get_workflow_state()
+@app.get("/status/{query_id}")
+async def get_status(query_id: str):
+    """Get the current status of a submitted workflow."""
+    return get_workflow(query_id).get_workflow_state()
 
-@app.get("/report")
-async def get_report():
-    """Get the final report."""
-    if not orchestrator.get_final_report():
+@app.get("/report/{query_id}")
+async def get_report(query_id: str):
+    """Get the final report of a submitted workflow."""
+    ctx = get_workflow(query_id)
+    if not ctx.final_report:
         raise HTTPException(status_code=404, detail="No report available yet")
     
     return {
-        "query": orchestrator.current_query,
-        "report": orchestrator.get_final_report()
+        "query_id": ctx.query_id,
+        "query": ctx.query,
+        "report": ctx.final_report
     }
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     """WebSocket endpoint for real-time updates."""
     await websocket.accept()
-    active_connections.append(websocket)
+    active_connections.add(websocket)
     logger.info("WebSocket client connected.")
+    # Updates are queued and sent by a writer task, so status callbacks never wait on the socket
+    outgoing = asyncio.Queue()
+    writer_task = asyncio.create_task(send_updates(websocket, outgoing))
     try:
         while True:
             # Wait for messages from the client
             data = await websocket.receive_text()
-            data = json.loads(data)
+            data = loads(data)
             if "query" in data:
                 query = data["query"]
-                logger.info(f"Received user query via WebSocket: {query}")
+                logger.info("Received user query via WebSocket: %s", query)
                 # Define a callback to send status updates
                 async def status_callback(message: str):
-                    await websocket.send_text(json.dumps({"status": message}))
-                    logger.info(f"Status update sent to WebSocket client: {message}")
-                # Process the query with the callback
-                final_report = await orchestrator.process_query(query, status_callback)
+                    outgoing.put_nowait({"status": message})
+                    logger.info("Status update queued for WebSocket client: %s", message)
+                # Stream a preview of the report as it is written
+                def partial_callback(chunk: str):
+                    outgoing.put_nowait({"partial": chunk})
+                # Process the query with the callbacks
+                ctx = await app.state.orchestrator.process_query(query, status_callback, on_partial=partial_callback)
                 # Send the final report
-                await websocket.send_text(json.dumps({
-                    "report": final_report,
+                outgoing.put_nowait({
+                    "report": ctx.final_report,
                     "status": "complete"
-                }))
-                logger.info("Final report sent to WebSocket client.")
+                })
+                logger.info("Final report queued for WebSocket client.")
     except WebSocketDisconnect:
-        active_connections.remove(websocket)
         logger.warning("WebSocket client disconnected.")
     except Exception as e:
-        try:
-            await websocket.send_text(json.dumps({"error": str(e)}))
-        except:
-            pass
-        logger.error(f"WebSocket error: {e}")
-        if websocket in active_connections:
-            active_connections.remove(websocket)
+        logger.error("WebSocket error: %s", e)
+        # Sent by the writer after any updates still queued, never concurrently with them
+        outgoing.put_nowait({"error": str(e)})
+        await flush_updates(outgoing, writer_task)
+    finally:
+        active_connections.discard(websocket)
+        writer_task.cancel()
+
+def uvicorn_options() -> Dict[str, str]:
+    """
+    Server implementation options for uvicorn: the libuv event loop and the C HTTP
+    parser when they are installed (they are optional, e.g. uvloop has no Windows build),
+    and permessage-deflate so large report frames are compressed on the wire.
+    
+    Returns:
+        Keyword arguments for uvicorn.run
+    """
+    return {
+        "loop": "uvloop" if importlib.util.find_spec("uvloop") else "asyncio",
+        "http": "httptools" if importlib.util.find_spec("httptools") else "h11",
+        "ws": "websockets",
+        "ws_per_message_deflate": True
+    }
 
 if __name__ == "__main__":
     # Run the server directly if this script is executed
-    uvicorn.run("app.server:app", host="0.0.0.0", port=8000, reload=True) 
\ No newline at end of file
+    uvicorn.run("app.server:app", host="0.0.0.0", port=8000, reload=True, **uvicorn_options()) 
\ No newline at end of file
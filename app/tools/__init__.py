@@ -1,10 +1,10 @@
 # Import all tool modules
 
 # Search tools
-from app.tools.search import web_search, social_media_search, news_search
+from app.tools.search import web_search, social_media_search, news_search, combined_search
 
 # Media tools
-from app.tools.media import download_media, extract_metadata, process_video_frames
+from app.tools.media import download_media, download_many, extract_metadata, process_video_frames
 
 # Verification tools
 from app.tools.verification import (
@@ -23,9 +23,11 @@ __all__ = [
     'web_search',
     'social_media_search',
     'news_search',
+    'combined_search',
     
     # Media tools
     'download_media',
+    'download_many',
     'extract_metadata',
     'process_video_frames',
     
@@ -1,31 +1,53 @@
 import os
 import json
 import asyncio
+import contextlib
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
+import aiofiles
 import aiohttp
-import uuid
+import hashlib
+import itertools
 import re
+from pathlib import Path
 
 from app.config.config import config
+from app.http_session import get_http_session
+from app.logging_config import logger
 
-async def download_media(url: str) -> Optional[str]:
+# Scale factor for the mock tools' simulated delays
+_LATENCY_SCALE = config.SIMULATE_LATENCY_SCALE
+
+# Directory downloaded media and extracted frames are saved to
+_MEDIA_BASE = Path(config.SAVE_MEDIA_PATH)
+
+# Upper bound on one media download, so a stalled host can't hold a download slot indefinitely
+_MEDIA_DOWNLOAD_TIMEOUT = aiohttp.ClientTimeout(total=config.MEDIA_DOWNLOAD_TIMEOUT_S)
+
+# Unique file names without an os.urandom call per file: a per-process random salt
+# plus a counter, hashed so names stay short and unguessable
+_FILE_NAME_SALT = os.urandom(8)
+_file_name_counter = itertools.count()
+
+def _unique_name() -> str:
+    """Return a 16-character hex name that is unique within this process."""
+    return hashlib.blake2b(_FILE_NAME_SALT + next(_file_name_counter).to_bytes(8, "little"), digest_size=8).hexdigest()
+
+async def download_media(url: str, session: Optional[aiohttp.ClientSession] = None) -> Optional[str]:
     """
     Download media from a URL and save it locally.
     
     Args:
         url: The URL of the media to download
+        session: The HTTP session to download with (defaults to the shared session)
         
     Returns:
         The local path to the downloaded media, or None if download failed
     """
-    print(f"Downloading media from: {url}")
-    
-    # In a real implementation, this would actually download the file
-    # For now, we'll simulate it
-    
-    # Simulate network delay
-    await asyncio.sleep(2)
+    logger.info("Downloading media from: %s", url)
+    session = session or get_http_session()
+    file_path = None
+    completed = False
     
     try:
         # Create a unique filename
@@ -37,18 +59,49 @@ async def download_media(url: str) -> Optional[str]:
         extension = re.sub(r'[^a-zA-Z0-9]', '', extension)
         
         # Generate unique filename
-        filename = f"{uuid.uuid4().hex}.{extension}"
-        file_path = os.path.join(config.SAVE_MEDIA_PATH, filename)
+        filename = f"{_unique_name()}.{extension}"
+        file_path = str(_MEDIA_BASE / filename)
         
-        # In a real implementation, we would download the file here
-        # For now, just pretend we did
-        with open(file_path, 'w') as f:
-            f.write(f"Mock media content from {url}")
+        # Stream the response to disk in chunks rather than holding the whole file in memory;
+        # file writes run off the event loop
+        async with session.get(url, timeout=_MEDIA_DOWNLOAD_TIMEOUT) as response:
+            response.raise_for_status()
+            async with aiofiles.open(file_path, 'wb') as f:
+                async for chunk in response.content.iter_chunked(64 * 1024):
+                    await f.write(chunk)
         
+        completed = True
         return file_path
     except Exception as e:
-        print(f"Error downloading media: {e}")
+        logger.error("Error downloading media: %s", e)
         return None
+    finally:
+        # Don't leave a partially written file behind after a failed or cancelled download
+        if not completed and file_path is not None:
+            with contextlib.suppress(OSError):
+                os.remove(file_path)
+
+async def download_many(urls: List[str], concurrency: int = 16, session: Optional[aiohttp.ClientSession] = None) -> List[Any]:
+    """
+    Download several media files concurrently, with at most `concurrency` downloads in flight.
+    
+    Args:
+        urls: The URLs of the media to download
+        concurrency: Maximum number of simultaneous downloads
+        session: The HTTP session to download with (defaults to the shared session)
+        
+    Returns:
+        One entry per URL, in order: the local path, None if the download failed,
+        or the exception raised for it
+    """
+    session = session or get_http_session()
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def download_one(url: str) -> Optional[str]:
+        async with semaphore:
+            return await download_media(url, session)
+    
+    return await asyncio.gather(*[download_one(url) for url in urls], return_exceptions=True)
 
 async def extract_metadata(file_path: str) -> Dict[str, Any]:
     """
@@ -60,13 +113,14 @@ async def extract_metadata(file_path: str) -> Dict[str, Any]:
     Returns:
         A dictionary of metadata
     """
-    print(f"Extracting metadata from: {file_path}")
+    logger.info("Extracting metadata from: %s", file_path)
     
     # In a real implementation, this would use tools like ExifTool
     # For now, we'll simulate it
     
     # Simulate processing delay
-    await asyncio.sleep(0.5)
+    if _LATENCY_SCALE:
+        await asyncio.sleep(0.5 * _LATENCY_SCALE)
     
     # Generate mock metadata
     extension = file_path.split('.')[-1].lower()
@@ -119,24 +173,25 @@ async def process_video_frames(video_path: str, frame_interval: int = 5) -> List
     Returns:
         A list of paths to the extracted frames
     """
-    print(f"Processing video frames from: {video_path}")
+    logger.info("Processing video frames from: %s", video_path)
     
     # In a real implementation, this would use OpenCV
     # For now, we'll simulate it
     
     # Simulate processing delay
-    await asyncio.sleep(3)
+    if _LATENCY_SCALE:
+        await asyncio.sleep(3 * _LATENCY_SCALE)
     
     # Generate mock frame paths
     frames = []
     for i in range(4):  # Mock 4 frames
-        frame_filename = f"{uuid.uuid4().hex}_frame_{i}.jpg"
-        frame_path = os.path.join(config.SAVE_MEDIA_PATH, frame_filename)
+        frame_filename = f"{_unique_name()}_frame_{i}.jpg"
+        frame_path = str(_MEDIA_BASE / frame_filename)
         
         # In a real implementation, we would extract and save the frame here
         # For now, just pretend we did
-        with open(frame_path, 'w') as f:
-            f.write(f"Mock video frame {i} from {video_path}")
+        async with aiofiles.open(frame_path, 'w') as f:
+            await f.write(f"Mock video frame {i} from {video_path}")
         
         frames.append(frame_path)
     
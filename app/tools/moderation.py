@@ -1,13 +1,141 @@
 import os
 import json
 import asyncio
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 import re
 
-async def check_content_policy(text: str) -> Dict[str, Any]:
+from app.logging_config import logger
+
+try:
+    import hyperscan
+except ImportError:  # hyperscan is optional; the re module is used without it
+    hyperscan = None
+
+# Simple keyword check (this is a very basic simulation)
+# In a real system, this would be much more sophisticated.
+# Each entry: (pattern, category, violation message template)
+_SENSITIVE_PATTERNS = [
+    (re.compile(pattern, re.IGNORECASE), category, message)
+    for pattern, category, message in [
+        # PII patterns (only the first characters of a match are reported)
+        (r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b', "pii", "PII detected: {:.3}***"),  # Phone numbers
+        (r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', "pii", "PII detected: {:.3}***"),  # Email
+        (r'\b\d{3}[-]?\d{2}[-]?\d{4}\b', "pii", "PII detected: {:.3}***"),  # SSN
+        
+        # Graphic content patterns
+        (r'\b(decapitat|dismember|mutilat|charred body|severed head)\w*\b', "graphic_content", "Graphic content detected: {}"),
+        
+        # Personal identifiers
+        (r'\bfull name: [A-Z][a-z]+ [A-Z][a-z]+\b', "pii", "Personal identifier detected: {}"),
+        (r'\bpassport number\b', "pii", "Personal identifier detected: {}"),
+        (r'\bidentity card\b', "pii", "Personal identifier detected: {}"),
+        
+        # Security sensitive info
+        (r'\bexact location of safehouse\b', "security_risk", "Security sensitive information detected: {}"),
+        (r'\bhiding place\b', "security_risk", "Security sensitive information detected: {}"),
+        (r'\bwitness location\b', "security_risk", "Security sensitive information detected: {}")
+    ]
+]
+
+def _compile_hyperscan_database() -> Optional[Any]:
+    """
+    Compile all sensitive patterns into one hyperscan database, so text is scanned once
+    for every pattern instead of once per pattern.
+    
+    Returns:
+        The compiled database, or None if hyperscan is unavailable or can't compile the patterns
+    """
+    if hyperscan is None:
+        return None
+    try:
+        database = hyperscan.Database()
+        database.compile(
+            expressions=[regex.pattern.encode("utf-8") for regex, _, _ in _SENSITIVE_PATTERNS],
+            ids=list(range(len(_SENSITIVE_PATTERNS))),
+            elements=len(_SENSITIVE_PATTERNS),
+            flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SOM_LEFTMOST] * len(_SENSITIVE_PATTERNS)
+        )
+        return database
+    except Exception as e:
+        logger.warning("Could not compile moderation patterns with hyperscan, falling back to re: %s", e)
+        return None
+
+_HYPERSCAN_DB = _compile_hyperscan_database()
+
+def _find_sensitive(text: str) -> List[Tuple[int, str]]:
     """
-    Check if text content violates content policies.
+    Find every match of the sensitive patterns in text.
+    
+    Args:
+        text: The text to scan
+        
+    Returns:
+        (pattern index, matched text) pairs, ordered by pattern and then by position
+    """
+    if _HYPERSCAN_DB is None:
+        return [
+            (index, match.group(0))
+            for index, (regex, _, _) in enumerate(_SENSITIVE_PATTERNS)
+            for match in regex.finditer(text)
+        ]
+    
+    data = text.encode("utf-8")
+    spans = []
+    
+    def on_match(pattern_id, start, end, flags, context):
+        spans.append((pattern_id, start, -end))
+    
+    _HYPERSCAN_DB.scan(data, match_event_handler=on_match)
+    
+    # Hyperscan reports every match end; keep the longest non-overlapping
+    # match per start position, as re.finditer would
+    matches = []
+    last_end: Dict[int, int] = {}
+    for pattern_id, start, neg_end in sorted(spans):
+        if start >= last_end.get(pattern_id, 0):
+            last_end[pattern_id] = -neg_end
+            matches.append((pattern_id, data[start:-neg_end].decode("utf-8", errors="replace")))
+    return matches
+
+# Patterns to anonymize with their replacements
+_ANON_PATTERNS = [
+    (re.compile(pattern), replacement)
+    for pattern, replacement in [
+        # PII
+        (r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b', "[PHONE NUMBER REDACTED]"),  # Phone numbers
+        (r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', "[EMAIL REDACTED]"),  # Email
+        (r'\b\d{3}[-]?\d{2}[-]?\d{4}\b', "[ID NUMBER REDACTED]"),  # SSN or ID
+        
+        # Names (very basic simulation - would use NER in real system)
+        (r'\b([A-Z][a-z]+ [A-Z][a-z]+)\b', "[PERSON]"),  # Simple name pattern
+        
+        # Specific sensitive information
+        (r'exact location: ([^\.]+)', "location: [LOCATION REDACTED]"),
+        (r'address: ([^\.]+)', "address: [ADDRESS REDACTED]"),
+        (r'phone: ([^\.]+)', "phone: [PHONE REDACTED]"),
+        (r'staying at ([^\.]+)', "staying at [LOCATION REDACTED]"),
+        
+        # Victim details
+        (r'victim\'s name is ([^\.]+)', "victim's name is [VICTIM]"),
+        (r'witness ([^\.]+)', "witness [WITNESS]")
+    ]
+]
+
+# All anonymization patterns as one alternation, so the text is rewritten in a single pass.
+# At each position the earliest-listed pattern that matches wins.
+_ANON_COMBINED = re.compile("|".join(
+    f"(?P<g{index}>{regex.pattern})" for index, (regex, _) in enumerate(_ANON_PATTERNS)
+))
+_ANON_REPLACEMENTS = [replacement for _, replacement in _ANON_PATTERNS]
+
+def _anon_replacement(match: re.Match) -> str:
+    """Return the replacement for whichever anonymization pattern matched."""
+    return _ANON_REPLACEMENTS[int(match.lastgroup[1:])]
+
+def _check_sync(text: str) -> Dict[str, Any]:
+    """
+    Scan text for policy violations (blocking; run on a worker thread).
     
     Args:
         text: The text to check
@@ -15,63 +143,19 @@ async def check_content_policy(text: str) -> Dict[str, Any]:
     Returns:
         A dictionary containing policy violation analysis
     """
-    print(f"Checking content policy for text ({len(text)} chars)")
-    
     # In a real implementation, this would use a content moderation API
     # (like OpenAI's moderation endpoint or another service)
     # For now, we'll simulate it
     
-    # Simulate processing delay
-    await asyncio.sleep(1)
-    
-    # Simple keyword check (this is a very basic simulation)
-    # In a real system, this would be much more sophisticated
-    sensitive_keywords = [
-        # PII patterns
-        r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b',  # Phone numbers
-        r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',  # Email
-        r'\b\d{3}[-]?\d{2}[-]?\d{4}\b',  # SSN
-        
-        # Graphic content patterns
-        r'\b(decapitat|dismember|mutilat|charred body|severed head)\w*\b',
-        
-        # Personal identifiers
-        r'\bfull name: [A-Z][a-z]+ [A-Z][a-z]+\b',
-        r'\bpassport number\b',
-        r'\bidentity card\b',
-        
-        # Security sensitive info
-        r'\bexact location of safehouse\b',
-        r'\bhiding place\b',
-        r'\bwitness location\b'
-    ]
-    
     violations = []
     categories = []
     
     # Check for keyword matches
-    for pattern in sensitive_keywords:
-        matches = re.finditer(pattern, text, re.IGNORECASE)
-        for match in matches:
-            if pattern in sensitive_keywords[:3]:  # PII patterns
-                if "pii" not in categories:
-                    categories.append("pii")
-                violations.append(f"PII detected: {match.group(0)[:3]}***")
-            
-            elif pattern in sensitive_keywords[3:5]:  # Graphic content
-                if "graphic_content" not in categories:
-                    categories.append("graphic_content")
-                violations.append(f"Graphic content detected: {match.group(0)}")
-            
-            elif pattern in sensitive_keywords[5:8]:  # Personal identifiers
-                if "pii" not in categories:
-                    categories.append("pii")
-                violations.append(f"Personal identifier detected: {match.group(0)}")
-            
-            elif pattern in sensitive_keywords[8:]:  # Security sensitive
-                if "security_risk" not in categories:
-                    categories.append("security_risk")
-                violations.append(f"Security sensitive information detected: {match.group(0)}")
+    for index, matched in _find_sensitive(text):
+        _, category, message = _SENSITIVE_PATTERNS[index]
+        if category not in categories:
+            categories.append(category)
+        violations.append(message.format(matched))
     
     # Check for general sentiment (very basic simulation)
     inflammatory_count = sum(1 for word in ["genocide", "apartheid", "ethnic cleansing", "war crimes"] 
@@ -93,9 +177,9 @@ async def check_content_policy(text: str) -> Dict[str, Any]:
     
     return results
 
-async def anonymize_text(text: str) -> str:
+def _anon_sync(text: str) -> str:
     """
-    Anonymize sensitive information in text.
+    Anonymize sensitive information in text (blocking; run on a worker thread).
     
     Args:
         text: The text to anonymize
@@ -103,38 +187,34 @@ async def anonymize_text(text: str) -> str:
     Returns:
         Anonymized text
     """
-    print(f"Anonymizing text ({len(text)} chars)")
-    
     # In a real implementation, this would use NER and other techniques
     # For now, we'll do some simple pattern replacements
+    return _ANON_COMBINED.sub(_anon_replacement, text)
+
+async def check_content_policy(text: str) -> Dict[str, Any]:
+    """
+    Check if text content violates content policies. The scan runs on a worker
+    thread so long reports don't block the event loop.
     
-    # Simulate processing delay
-    await asyncio.sleep(1.5)
-    
-    # Patterns to anonymize with their replacements
-    anonymization_patterns = [
-        # PII
-        (r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b', "[PHONE NUMBER REDACTED]"),  # Phone numbers
-        (r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', "[EMAIL REDACTED]"),  # Email
-        (r'\b\d{3}[-]?\d{2}[-]?\d{4}\b', "[ID NUMBER REDACTED]"),  # SSN or ID
-        
-        # Names (very basic simulation - would use NER in real system)
-        (r'\b([A-Z][a-z]+ [A-Z][a-z]+)\b', "[PERSON]"),  # Simple name pattern
-        
-        # Specific sensitive information
-        (r'exact location: ([^\.]+)', "location: [LOCATION REDACTED]"),
-        (r'address: ([^\.]+)', "address: [ADDRESS REDACTED]"),
-        (r'phone: ([^\.]+)', "phone: [PHONE REDACTED]"),
-        (r'staying at ([^\.]+)', "staying at [LOCATION REDACTED]"),
+    Args:
+        text: The text to check
         
-        # Victim details
-        (r'victim\'s name is ([^\.]+)', "victim's name is [VICTIM]"),
-        (r'witness ([^\.]+)', "witness [WITNESS]")
-    ]
-    
-    anonymized_text = text
-    
-    for pattern, replacement in anonymization_patterns:
-        anonymized_text = re.sub(pattern, replacement, anonymized_text)
+    Returns:
+        A dictionary containing policy violation analysis
+    """
+    logger.info("Checking content policy for text (%s chars)", len(text))
+    return await asyncio.to_thread(_check_sync, text)
+
+async def anonymize_text(text: str) -> str:
+    """
+    Anonymize sensitive information in text. The rewrite runs on a worker
+    thread so long reports don't block the event loop.
     
-    return anonymized_text 
\ No newline at end of file
+    Args:
+        text: The text to anonymize
+        
+    Returns:
+        Anonymized text
+    """
+    logger.info("Anonymizing text (%s chars)", len(text))
+    return await asyncio.to_thread(_anon_sync, text)
@@ -1,21 +1,149 @@
 import os
+import copy
 import json
 import asyncio
-from typing import Dict, List, Any, Optional
+import functools
+import inspect
+from typing import Dict, List, Any, Awaitable, Callable, Iterator, Optional
 from datetime import datetime, timedelta
 import aiohttp
 import re
-from openai import OpenAI
 from dotenv import load_dotenv
-import requests
+
+from app.config.config import config
+from app.http_session import get_http_session, get_openai_client
+from app.logging_config import logger
+from app.models import SocialPost
+from app.serialization import loads
+from app.validation_cache import ValidationCache
 
 load_dotenv()
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 LLM_MODEL = os.getenv("LLM_MODEL", "gpt-4.1")
-client = OpenAI(api_key=OPENAI_API_KEY)
+# Searches aren't wrapped in BaseAgent._with_retries, so let the SDK retry them on the shared client
+_SEARCH_MAX_RETRIES = 2
 SOCIAL_SEARCHER_API_KEY = os.getenv("SOCIAL_SEARCHER_API_KEY")
 
+# Caps Social Searcher requests in flight across all searches, to stay under the provider's rate limit
+_social_search_semaphore = asyncio.Semaphore(config.SOCIAL_SEARCH_CONCURRENCY)
+
+# Upper bound on one Social Searcher request, so a stalled platform can't hold up collection
+_SOCIAL_SEARCH_TIMEOUT = aiohttp.ClientTimeout(total=config.SOCIAL_SEARCH_TIMEOUT_S)
+
+# Recent search results, shared across queries so retries and overlapping search terms
+# don't hit the search APIs again
+_search_cache = ValidationCache(config.SEARCH_CACHE_SIZE, config.SEARCH_CACHE_TTL_S)
+
+class _Uncacheable:
+    """Marks search results that are returned to the caller but never cached, e.g. degraded ones."""
+
+class _PartialResults(_Uncacheable, list):
+    """Search results missing some sources because their requests failed."""
+
+class _FallbackResults(_Uncacheable, dict):
+    """Search results that couldn't be parsed as requested, returned in a fallback shape."""
+
+def _cached_search(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    """
+    Cache a search function's results by its arguments (other than the HTTP session).
+    
+    Args:
+        func: The search coroutine function to wrap
+        
+    Returns:
+        The wrapped search function
+    """
+    signature = inspect.signature(func)
+    
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs) -> Any:
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        params = [value for name, value in bound.arguments.items() if name != "session"]
+        key = ValidationCache.make_key(func.__name__, *params)
+        result = await _search_cache.get_or_call(key, func(*args, **kwargs))
+        if isinstance(result, _Uncacheable):
+            # Don't serve degraded results until the TTL expires; the next search retries
+            _search_cache.discard(key, result)
+            result = dict(result) if isinstance(result, dict) else list(result)
+        # Deep copy so callers can't modify the cached results (or the dicts and lists inside them)
+        return copy.deepcopy(result)
+    
+    return wrapper
+
+def get_cache_stats() -> Dict[str, int]:
+    """
+    Get hit/miss counters for the search result cache.
+    
+    Returns:
+        The number of hits (including coalesced in-flight calls), misses and cached results
+    """
+    return _search_cache.stats()
+
+def _parse_search_response(response: Any) -> Dict[str, Any]:
+    """
+    Extract the message text and URL citations from an OpenAI web search response.
+    
+    Args:
+        response: The Responses API response
+        
+    Returns:
+        A dict with 'text' and 'citations' (if any)
+    """
+    text = ""
+    citations = []
+    output = getattr(response, 'output', None)
+    if output:
+        for item in output:
+            if getattr(item, 'type', None) != "message":
+                continue
+            content = getattr(item, 'content', None)
+            if not content:
+                continue
+            content_item = content[0]
+            if getattr(content_item, 'type', None) != "output_text":
+                continue
+            text = getattr(content_item, 'text', "")
+            citations = [
+                {"url": getattr(ann, 'url', None), "title": getattr(ann, 'title', None)}
+                for ann in getattr(content_item, 'annotations', None) or ()
+                if getattr(ann, 'type', None) == "url_citation"
+            ]
+            break # Assuming one message item with the main content
+    else: # Fallback for simpler structure
+        text = getattr(response, 'output_text', "")
+    
+    return {"text": text, "citations": citations}
+
+def _normalize_posts(posts: List[Dict[str, Any]]) -> Iterator[SocialPost]:
+    """
+    Convert Social Searcher posts to normalized social media posts, one at a time,
+    so callers can extend their results without an intermediate list per platform.
+    
+    Args:
+        posts: The posts from a Social Searcher response
+        
+    Yields:
+        Normalized social media posts
+    """
+    for post in posts:
+        popularity = post.get("popularity", {})
+        yield SocialPost(
+            platform=post.get("network"),
+            user=post.get("user", {}).get("name"),
+            url=post.get("url"),
+            text=post.get("text"),
+            date=post.get("posted"),
+            media_url=post.get("image"),
+            likes=popularity.get("likes", 0),
+            shares=popularity.get("shares", 0),
+            comments=popularity.get("comments", 0),
+            sentiment=post.get("sentiment"),
+            type=post.get("type"),
+            lang=post.get("lang")
+        )
+
 # Mock implementations - in a real system, these would connect to actual APIs
+@_cached_search
 async def web_search(query: str, max_results: int = 10, search_context_size: str = "medium") -> List[Dict[str, Any]]:
     """
     Search the web for information related to the query using OpenAI's web search tool.
@@ -26,42 +154,19 @@ async def web_search(query: str, max_results: int = 10, search_context_size: str
     Returns:
         A list of dicts with 'text' and 'citations' (if any)
     """
-    print(f"Searching web for: {query} (OpenAI Web Search API)")
-    loop = asyncio.get_event_loop()
-    def sync_search():
-        response = client.responses.create(
-            model=LLM_MODEL,
-            input=query,
-            tools=[{
-                "type": "web_search_preview",
-                "search_context_size": search_context_size
-            }],
-        )
-        # Parse the response for message content and citations
-        text = ""
-        citations = []
-        if hasattr(response, 'output') and response.output:
-            for item in response.output:
-                if hasattr(item, 'type') and item.type == "message" and hasattr(item, 'content') and item.content:
-                    content_item = item.content[0]
-                    if hasattr(content_item, 'type') and content_item.type == "output_text":
-                        text = content_item.text if hasattr(content_item, 'text') else ""
-                        if hasattr(content_item, 'annotations') and content_item.annotations:
-                            for ann in content_item.annotations:
-                                if hasattr(ann, 'type') and ann.type == "url_citation":
-                                    citations.append({
-                                        "url": ann.url if hasattr(ann, 'url') else None,
-                                        "title": ann.title if hasattr(ann, 'title') else None
-                                    })
-                        break # Assuming one message item with the main content
-        elif hasattr(response, 'output_text'): # Fallback for simpler structure
-            text = response.output_text
-        
-        return {"text": text, "citations": citations}
-    result = await loop.run_in_executor(None, sync_search)
-    return [result]
+    logger.info("Searching web for: %s (OpenAI Web Search API)", query)
+    response = await get_openai_client().with_options(max_retries=_SEARCH_MAX_RETRIES).responses.create(
+        model=LLM_MODEL,
+        input=query,
+        tools=[{
+            "type": "web_search_preview",
+            "search_context_size": search_context_size
+        }],
+    )
+    return [_parse_search_response(response)]
 
-async def social_media_search(query: str, platforms: Optional[List[str]] = None, max_results: int = 10, lang: str = "en") -> List[Dict[str, Any]]:
+@_cached_search
+async def social_media_search(query: str, platforms: Optional[List[str]] = None, max_results: int = 10, lang: str = "en", session: Optional[aiohttp.ClientSession] = None) -> List[SocialPost]:
     """
     Search social media for posts related to the query using Social Searcher API.
     Args:
@@ -69,15 +174,18 @@ async def social_media_search(query: str, platforms: Optional[List[str]] = None,
         platforms: List of platforms/networks (e.g., ["twitter", "reddit"])
         max_results: Number of results to return
         lang: Language code (default: "en")
+        session: The HTTP session to search with (defaults to the shared session)
     Returns:
-        A list of normalized social media post dicts
+        A list of normalized social media posts. If some platforms failed, the posts
+        from the others are returned but not cached.
     """
-    print(f"Searching social media for: {query} on platforms: {platforms} (Social Searcher API)")
+    logger.info("Searching social media for: %s on platforms: %s (Social Searcher API)", query, platforms)
     if not SOCIAL_SEARCHER_API_KEY:
         raise RuntimeError("Missing SOCIAL_SEARCHER_API_KEY in environment. Please check your .env file.")
     
     results = []
-    loop = asyncio.get_event_loop()
+    failed = False
+    session = session or get_http_session()
 
     async def fetch_platform_data(platform: Optional[str]):
         params = {
@@ -92,46 +200,33 @@ async def social_media_search(query: str, platforms: Optional[List[str]] = None,
         url = "https://api.social-searcher.com/v2/search"
         
         try:
-            # Run the synchronous requests.get call in a thread pool
-            resp = await loop.run_in_executor(None, lambda: requests.get(url, params=params))
+            async with _social_search_semaphore, session.get(url, params=params, timeout=_SOCIAL_SEARCH_TIMEOUT) as resp:
+                if resp.status == 200:
+                    # Decode with orjson when available; Social Searcher payloads can be large
+                    data = loads(await resp.read())
+                else:
+                    resp_text = await resp.text()
             
-            if resp.status_code == 200:
-                data = resp.json()
-                platform_results = []
-                for post in data.get("posts", []):
-                    platform_results.append({
-                        "platform": post.get("network"),
-                        "user": post.get("user", {}).get("name"),
-                        "url": post.get("url"),
-                        "text": post.get("text"),
-                        "date": post.get("posted"),
-                        "media_url": post.get("image"),
-                        "likes": post.get("popularity", {}).get("likes", 0),
-                        "shares": post.get("popularity", {}).get("shares", 0),
-                        "comments": post.get("popularity", {}).get("comments", 0),
-                        "sentiment": post.get("sentiment"),
-                        "type": post.get("type"),
-                        "lang": post.get("lang"),
-                        "raw": post
-                    })
-                return platform_results
-            elif resp.status_code == 405:
+            if resp.status == 200:
+                # Raw posts; they are normalized straight into the combined results
+                return data.get("posts", [])
+            elif resp.status == 405:
                 error_message = (
-                    f"Social Searcher API error: 405 Method Not Allowed. Response: {resp.text}. "
+                    f"Social Searcher API error: 405 Method Not Allowed. Response: {resp_text}. "
                     f"This often indicates a permission issue with your API key (SOCIAL_SEARCHER_API_KEY) "
                     f"for the network '{platform}' or the API version. "
                     f"Please verify your key, its permissions, and that the network identifier is correct. "
                     f"The API docs state 'network: web...' and to 'Contact us for the list of supported networks'."
                 )
-                print(error_message) # Log detailed error
+                logger.error(error_message) # Log detailed error
                 # Optionally, re-raise or return empty to not break the whole search
                 # For now, let's let it raise to make the issue visible
                 raise RuntimeError(error_message)
 
             else:
-                raise RuntimeError(f"Social Searcher API error: {resp.status_code} {resp.text} for network: {platform}")
-        except requests.exceptions.RequestException as e:
-            raise RuntimeError(f"Request failed for {platform or 'general search'}: {e}")
+                raise RuntimeError(f"Social Searcher API error: {resp.status} {resp_text} for network: {platform}")
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise RuntimeError(f"Request failed for {platform or 'general search'}: {e!r}")
 
     # Create a list of tasks to run concurrently if platforms are specified
     if platforms and isinstance(platforms, list):
@@ -139,20 +234,21 @@ async def social_media_search(query: str, platforms: Optional[List[str]] = None,
         platform_results_list = await asyncio.gather(*tasks, return_exceptions=True)
         for res_list in platform_results_list:
             if isinstance(res_list, list):
-                results.extend(res_list)
+                results.extend(_normalize_posts(res_list))
             elif isinstance(res_list, Exception):
-                # Handle or log exceptions from individual platform fetches if needed
-                print(f"Error fetching data for a platform: {res_list}") # Or raise it
+                # Keep the other platforms' posts, but don't cache the incomplete results
+                logger.error("Error fetching data for a platform: %s", res_list)
+                failed = True
     elif platforms is None: # Perform a general search if no specific platforms
-        results.extend(await fetch_platform_data(None))
+        results.extend(_normalize_posts(await fetch_platform_data(None)))
     else: # If platforms is not a list or None (e.g. a single string)
-        print(f"Warning: 'platforms' parameter should be a list or None. Received: {platforms}. Treating as a single platform search.")
-        results.extend(await fetch_platform_data(str(platforms)))
-
-
-    return results
+        logger.warning("'platforms' parameter should be a list or None. Received: %s. Treating as a single platform search.", platforms)
+        results.extend(_normalize_posts(await fetch_platform_data(str(platforms))))
+    
+    return _PartialResults(results) if failed else results
 
 # Function to implement in a real system - connects to a proper news API
+@_cached_search
 async def news_search(query: str, days_back: int = 30, max_results: int = 10, search_context_size: str = "medium") -> List[Dict[str, Any]]:
     """
     Search news sources for recent articles related to the query using OpenAI's web search tool.
@@ -164,43 +260,63 @@ async def news_search(query: str, days_back: int = 30, max_results: int = 10, se
     Returns:
         A list of dicts with 'text' and 'citations' (if any)
     """
-    print(f"Searching news for: {query} (OpenAI Web Search API)")
-    loop = asyncio.get_event_loop()
-    def sync_search():
-        # Craft a news-specific prompt
-        news_prompt = (
-            f"Find recent news articles from reputable sources (such as Reuters, Al Jazeera, Haaretz, BBC, The Guardian, New York Times, etc.) "
-            f"from the last {days_back} days about: {query}. "
-            f"List the most relevant articles with their sources and dates."
-        )
-        response = client.responses.create(
-            model=LLM_MODEL,
-            tools=[{
-                "type": "web_search_preview",
-                "search_context_size": search_context_size
-            }],
-            input=news_prompt
-        )
-        # Find the message output item
-        text = ""
-        citations = []
-        if hasattr(response, 'output') and response.output:
-            for item in response.output:
-                if hasattr(item, 'type') and item.type == "message" and hasattr(item, 'content') and item.content:
-                    content_item = item.content[0]
-                    if hasattr(content_item, 'type') and content_item.type == "output_text":
-                        text = content_item.text if hasattr(content_item, 'text') else ""
-                        if hasattr(content_item, 'annotations') and content_item.annotations:
-                            for ann in content_item.annotations:
-                                if hasattr(ann, 'type') and ann.type == "url_citation":
-                                    citations.append({
-                                        "url": ann.url if hasattr(ann, 'url') else None,
-                                        "title": ann.title if hasattr(ann, 'title') else None
-                                    })
-                        break # Assuming one message item with the main content
-        elif hasattr(response, 'output_text'): # Fallback for simpler structure
-            text = response.output_text
-
-        return {"text": text, "citations": citations}
-    result = await loop.run_in_executor(None, sync_search)
-    return [result] 
\ No newline at end of file
+    logger.info("Searching news for: %s (OpenAI Web Search API)", query)
+    # Craft a news-specific prompt
+    news_prompt = (
+        f"Find recent news articles from reputable sources (such as Reuters, Al Jazeera, Haaretz, BBC, The Guardian, New York Times, etc.) "
+        f"from the last {days_back} days about: {query}. "
+        f"List the most relevant articles with their sources and dates."
+    )
+    response = await get_openai_client().with_options(max_retries=_SEARCH_MAX_RETRIES).responses.create(
+        model=LLM_MODEL,
+        tools=[{
+            "type": "web_search_preview",
+            "search_context_size": search_context_size
+        }],
+        input=news_prompt
+    )
+    return [_parse_search_response(response)]
+
+@_cached_search
+async def combined_search(query: str, days_back: int = 30, search_context_size: str = "medium") -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Search the web and recent news in one OpenAI web search call, instead of one
+    round-trip each through web_search and news_search.
+    Args:
+        query: The search query
+        days_back: How many days back to look for news (included in the prompt)
+        search_context_size: "low", "medium", or "high"
+    Returns:
+        A dict with 'web' and 'news' lists of results, each with 'title', 'url', 'source',
+        'date' and 'snippet'. If the model doesn't return valid JSON, 'web' holds a single
+        dict with 'text' and 'citations' and 'news' is empty; that result isn't cached.
+    """
+    logger.info("Searching web and news for: %s (OpenAI Web Search API)", query)
+    combined_prompt = (
+        f"Search the web for information about: {query}. "
+        f"Separately, find recent news articles from reputable sources (such as Reuters, Al Jazeera, Haaretz, BBC, The Guardian, New York Times, etc.) "
+        f"from the last {days_back} days about the same topic. "
+        f'Respond with only a JSON object of the form {{"web": [...], "news": [...]}}, where each result is an object '
+        f'with the keys "title", "url", "source", "date" (YYYY-MM-DD) and "snippet".'
+    )
+    response = await get_openai_client().with_options(max_retries=_SEARCH_MAX_RETRIES).responses.create(
+        model=LLM_MODEL,
+        input=combined_prompt,
+        tools=[{
+            "type": "web_search_preview",
+            "search_context_size": search_context_size
+        }],
+    )
+    result = _parse_search_response(response)
+    
+    # The JSON may come wrapped in a Markdown code block
+    text = result["text"].strip().removeprefix("```json").removeprefix("```").removesuffix("```")
+    try:
+        parsed = loads(text)
+        return {
+            "web": [r for r in parsed.get("web", []) if isinstance(r, dict)],
+            "news": [r for r in parsed.get("news", []) if isinstance(r, dict)]
+        }
+    except (ValueError, AttributeError):
+        logger.warning("Combined search returned no valid JSON for: %s", query)
+        return _FallbackResults(web=[result], news=[])
@@ -1,10 +1,127 @@
-import os
 import json
 import asyncio
+import functools
+import hashlib
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 import re
 
+from app.config.config import config
+from app.logging_config import logger
+
+try:
+    import ahocorasick
+except ImportError:  # pyahocorasick is optional; the re module is used without it
+    ahocorasick = None
+
+try:
+    from ciso8601 import parse_datetime
+except ImportError:  # ciso8601 is optional; datetime.fromisoformat is used without it
+    def parse_datetime(value: str) -> datetime:
+        """
+        Parse an ISO 8601 timestamp, including a trailing 'Z' for UTC.
+        
+        Args:
+            value: The timestamp string
+            
+        Returns:
+            The parsed datetime
+        """
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+# Scale factor for the mock tools' simulated delays
+_LATENCY_SCALE = config.SIMULATE_LATENCY_SCALE
+
+@functools.lru_cache(maxsize=4096)
+def _path_hash(path: str) -> int:
+    """
+    Hash an image path into the integer the mock tools derive their "random" results from.
+    Works for any file name, and is computed once per path across the tools.
+    
+    Args:
+        path: The image path
+        
+    Returns:
+        A 64-bit integer hash of the path
+    """
+    return int.from_bytes(hashlib.blake2b(path.encode("utf-8"), digest_size=8).digest(), "big")
+
+# Accepted URL schemes for the metadata URL format check
+_URL_PREFIXES = ("http://", "https://")
+
+# Mock lists of reliable and unreliable sources
+_RELIABLE_SOURCE_NAMES = (
+    "BBC", "Reuters", "Associated Press", "Al Jazeera", "The Guardian",
+    "CNN", "Human Rights Watch", "Amnesty International", "New York Times"
+)
+
+_UNRELIABLE_SOURCE_NAMES = (
+    "FakeNewsDaily", "ConspiracyTruth", "PropagandaNet", "StateMediaChannel"
+)
+
+# Lowercased once, for the common case of a source name that is exactly a known source
+_RELIABLE = frozenset(name.lower() for name in _RELIABLE_SOURCE_NAMES)
+_UNRELIABLE = frozenset(name.lower() for name in _UNRELIABLE_SOURCE_NAMES)
+
+def _build_source_automaton() -> Optional[Any]:
+    """
+    Build an Aho-Corasick automaton over all known source names, so a source name is
+    matched against every known source in one linear scan however long the lists grow.
+    
+    Returns:
+        The automaton, or None if pyahocorasick is unavailable
+    """
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for name in _RELIABLE_SOURCE_NAMES:
+        automaton.add_word(name.lower(), "reliable")
+    # Added last so a name on both lists counts as unreliable
+    for name in _UNRELIABLE_SOURCE_NAMES:
+        automaton.add_word(name.lower(), "unreliable")
+    automaton.make_automaton()
+    return automaton
+
+_SOURCE_AUTOMATON = _build_source_automaton()
+
+# Fallback without pyahocorasick: each list compiled into one case-insensitive alternation
+_RELIABLE_SOURCES = re.compile("|".join(map(re.escape, _RELIABLE_SOURCE_NAMES)), re.IGNORECASE)
+_UNRELIABLE_SOURCES = re.compile("|".join(map(re.escape, _UNRELIABLE_SOURCE_NAMES)), re.IGNORECASE)
+
+def _source_category(source_name: str) -> str:
+    """
+    Classify a source name by the known sources it contains (case-insensitive);
+    an unreliable match takes precedence over a reliable one.
+    
+    Args:
+        source_name: The name of the source
+        
+    Returns:
+        "reliable", "unreliable" or "unknown"
+    """
+    source_lower = source_name.lower()
+    if source_lower in _UNRELIABLE:
+        return "unreliable"
+    if source_lower in _RELIABLE:
+        return "reliable"
+    
+    if _SOURCE_AUTOMATON is None:
+        if _UNRELIABLE_SOURCES.search(source_name):
+            return "unreliable"
+        if _RELIABLE_SOURCES.search(source_name):
+            return "reliable"
+        return "unknown"
+    
+    category = "unknown"
+    for _, match_category in _SOURCE_AUTOMATON.iter(source_lower):
+        if match_category == "unreliable":
+            return match_category
+        category = match_category
+    return category
+
+# Reliability score for each source category
+_RELIABILITY_SCORES = {"reliable": 0.9, "unreliable": 0.1, "unknown": 0.5}
+
 async def reverse_image_search(image_path: str) -> Dict[str, Any]:
     """
     Perform a reverse image search to find matches.
@@ -15,29 +132,32 @@ async def reverse_image_search(image_path: str) -> Dict[str, Any]:
     Returns:
         A dictionary containing search results
     """
-    print(f"Performing reverse image search for: {image_path}")
+    logger.info("Performing reverse image search for: %s", image_path)
     
     # In a real implementation, this would use a service like Google Images, Yandex, or TinEye
     # For now, we'll simulate it
     
     # Simulate processing delay
-    await asyncio.sleep(2.5)
+    if _LATENCY_SCALE:
+        await asyncio.sleep(2.5 * _LATENCY_SCALE)
     
     # Generate mock results
-    has_matches = bool(int(os.path.basename(image_path).split('.')[0], 16) % 3)  # Random based on filename
+    has_matches = bool(_path_hash(image_path) % 3)  # Random based on filename
     
+    now = datetime.now()
     results = {
         "query_image": image_path,
-        "search_timestamp": datetime.now().isoformat(),
+        "search_timestamp": now.isoformat(),
         "service": "MockReverseImageSearch"
     }
     
     if has_matches:
         # Generate mock matches
         matches = []
+        step = timedelta(days=5)
         for i in range(1, 4):  # 1-3 matches
             # Create dates slightly in the past
-            date = (datetime.now() - timedelta(days=i*5)).strftime("%Y-%m-%d")
+            date = (now - i * step).strftime("%Y-%m-%d")
             
             matches.append({
                 "url": f"https://example.com/image_{i}",
@@ -65,17 +185,18 @@ async def geolocate_image(image_path: str) -> Dict[str, Any]:
     Returns:
         A dictionary containing geolocation results
     """
-    print(f"Attempting to geolocate image: {image_path}")
+    logger.info("Attempting to geolocate image: %s", image_path)
     
     # In a real implementation, this would use either EXIF GPS data or visual features
     # For now, we'll simulate it
     
     # Simulate processing delay
-    await asyncio.sleep(3)
+    if _LATENCY_SCALE:
+        await asyncio.sleep(3 * _LATENCY_SCALE)
     
     # Generate mock results based on the image hash
-    img_hash = os.path.basename(image_path).split('.')[0]
-    has_location = bool(int(img_hash, 16) % 2)  # Random based on filename
+    img_hash = _path_hash(image_path)
+    has_location = bool(img_hash % 2)  # Random based on filename
     
     results = {
         "query_image": image_path,
@@ -93,13 +214,13 @@ async def geolocate_image(image_path: str) -> Dict[str, Any]:
         ]
         
         # Pick a location based on the image hash
-        location_index = int(img_hash, 16) % len(locations)
+        location_index = img_hash % len(locations)
         location = locations[location_index]
         
         results.update({
             "location": location["name"],
             "coordinates": location["coords"],
-            "confidence": 0.7 + (int(img_hash[-1], 16) / 40),  # Random confidence 0.7-0.95
+            "confidence": 0.7 + ((img_hash & 0xF) / 40),  # Random confidence 0.7-0.95
             "method": "visual_matching",  # In a real system, this could be "exif_data" or "visual_matching"
             "landmarks_identified": ["building", "skyline", "street sign"]
         })
@@ -124,18 +245,19 @@ async def analyze_shadows(image_path: str, claimed_location: Optional[str] = Non
     Returns:
         A dictionary containing shadow analysis results
     """
-    print(f"Analyzing shadows in image: {image_path}")
+    logger.info("Analyzing shadows in image: %s", image_path)
     
     # In a real implementation, this would use computer vision to detect shadows
     # and sun position calculations (e.g., using SunCalc)
     # For now, we'll simulate it
     
     # Simulate processing delay
-    await asyncio.sleep(2)
+    if _LATENCY_SCALE:
+        await asyncio.sleep(2 * _LATENCY_SCALE)
     
     # Generate mock results
-    img_hash = os.path.basename(image_path).split('.')[0]
-    consistent = bool(int(img_hash, 16) % 3)  # Random based on filename
+    img_hash = _path_hash(image_path)
+    consistent = bool(img_hash % 3)  # Random based on filename
     
     results = {
         "query_image": image_path,
@@ -148,20 +270,20 @@ async def analyze_shadows(image_path: str, claimed_location: Optional[str] = Non
                 "consistent": True,
                 "claimed_time": claimed_time,
                 "estimated_time": claimed_time,  # Same as claimed in consistent case
-                "confidence": 0.8 + (int(img_hash[-1], 16) / 50),  # Random 0.8-0.98
+                "confidence": 0.8 + ((img_hash & 0xF) / 50),  # Random 0.8-0.98
                 "shadow_direction": "northeast",
                 "sun_elevation": "34 degrees"
             })
         else:
             # Estimate a different time
-            claimed_datetime = datetime.fromisoformat(claimed_time.replace('Z', '+00:00'))
+            claimed_datetime = parse_datetime(claimed_time)
             estimated_datetime = claimed_datetime + timedelta(hours=4)  # 4 hours difference
             
             results.update({
                 "consistent": False,
                 "claimed_time": claimed_time,
                 "estimated_time": estimated_datetime.isoformat(),
-                "confidence": 0.6 + (int(img_hash[-1], 16) / 40),  # Random 0.6-0.85
+                "confidence": 0.6 + ((img_hash & 0xF) / 40),  # Random 0.6-0.85
                 "shadow_direction": "northwest",  # Different from what would be expected
                 "sun_elevation": "58 degrees",
                 "note": "Shadow angles inconsistent with claimed time"
@@ -187,41 +309,18 @@ async def check_source_reliability(source_name: str, url: str = "") -> Dict[str,
     Returns:
         A dictionary containing reliability assessment
     """
-    print(f"Checking reliability of source: {source_name}")
+    logger.info("Checking reliability of source: %s", source_name)
     
     # In a real implementation, this would check against a database of known sources
     # For now, we'll simulate it
     
     # Simulate processing delay
-    await asyncio.sleep(0.5)
-    
-    # List of mock reliable and unreliable sources
-    reliable_sources = [
-        "BBC", "Reuters", "Associated Press", "Al Jazeera", "The Guardian",
-        "CNN", "Human Rights Watch", "Amnesty International", "New York Times"
-    ]
-    
-    unreliable_sources = [
-        "FakeNewsDaily", "ConspiracyTruth", "PropagandaNet", "StateMediaChannel"
-    ]
-    
-    # Check if the source name matches (case-insensitive) any in our lists
-    source_lower = source_name.lower()
-    
-    reliability_score = 0.5  # Default neutral
-    reliability_category = "unknown"
-    
-    for source in reliable_sources:
-        if source.lower() in source_lower:
-            reliability_score = 0.9
-            reliability_category = "reliable"
-            break
+    if _LATENCY_SCALE:
+        await asyncio.sleep(0.5 * _LATENCY_SCALE)
     
-    for source in unreliable_sources:
-        if source.lower() in source_lower:
-            reliability_score = 0.1
-            reliability_category = "unreliable"
-            break
+    # Check if the source name contains (case-insensitive) any of the known sources
+    reliability_category = _source_category(source_name)
+    reliability_score = _RELIABILITY_SCORES[reliability_category]
     
     # In a real system, we'd also check domain reputation, fact-checking databases, etc.
     results = {
@@ -245,18 +344,20 @@ async def check_metadata_consistency(item: Dict[str, Any]) -> Dict[str, Any]:
     Returns:
         A dictionary containing consistency assessment
     """
-    print(f"Checking metadata consistency for item: {item.get('id', 'unknown')}")
+    logger.info("Checking metadata consistency for item: %s", item.get('id', 'unknown'))
     
     # In a real implementation, this would perform various consistency checks
     # For now, we'll simulate it
     
     # Simulate processing delay
-    await asyncio.sleep(0.7)
+    if _LATENCY_SCALE:
+        await asyncio.sleep(0.7 * _LATENCY_SCALE)
     
     # Initialize results
+    now = datetime.now()
     results = {
         "item_id": item.get("id", "unknown"),
-        "check_timestamp": datetime.now().isoformat(),
+        "check_timestamp": now.isoformat(),
         "checks_performed": []
     }
     
@@ -266,8 +367,7 @@ async def check_metadata_consistency(item: Dict[str, Any]) -> Dict[str, Any]:
     # Check 1: Timestamp in reasonable range
     if "timestamp" in item:
         try:
-            item_date = datetime.fromisoformat(item["timestamp"].replace('Z', '+00:00'))
-            now = datetime.now()
+            item_date = parse_datetime(item["timestamp"])
             
             if item_date > now:
                 checks.append({
@@ -287,7 +387,7 @@ async def check_metadata_consistency(item: Dict[str, Any]) -> Dict[str, Any]:
                     "result": "pass",
                     "details": "Timestamp is within a reasonable range"
                 })
-        except:
+        except (ValueError, TypeError, AttributeError):
             checks.append({
                 "check": "timestamp_format",
                 "result": "fail",
@@ -296,7 +396,7 @@ async def check_metadata_consistency(item: Dict[str, Any]) -> Dict[str, Any]:
     
     # Check 2: Source URL format
     if "url" in item:
-        if re.match(r'^https?://', item["url"]):
+        if isinstance(item["url"], str) and item["url"].startswith(_URL_PREFIXES):
             checks.append({
                 "check": "url_format",
                 "result": "pass",
@@ -336,4 +436,4 @@ async def check_metadata_consistency(item: Dict[str, Any]) -> Dict[str, Any]:
         results["result"] = "consistent"
         results["confidence"] = 0.9
     
-    return results 
\ No newline at end of file
+    return results
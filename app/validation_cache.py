@@ -0,0 +1,108 @@
+"""
+In-memory cache of tool results, so items that share a source, an image or
+other structured context (and repeated searches) reuse one tool call.
+"""
+
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Dict, Optional, Tuple
+
+class ValidationCache:
+    """
+    LRU cache of tool results keyed by a hash of the tool name and its inputs.
+    Concurrent callers with the same key await the same in-flight call, and
+    failed calls are not cached.
+    """
+    
+    def __init__(self, maxsize: int = 128, ttl_s: Optional[float] = None):
+        """
+        Initialize the cache.
+        
+        Args:
+            maxsize: Maximum number of entries; the least recently used entry is evicted first
+            ttl_s: How long results stay valid, in seconds, or None to keep them until evicted
+        """
+        self.maxsize = maxsize
+        self.ttl_s = ttl_s
+        self._entries: "OrderedDict[bytes, Tuple[float, asyncio.Future]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        # Hits that joined a call still in flight rather than reading a finished result
+        self.coalesced = 0
+    
+    @staticmethod
+    def make_key(tool_name: str, *parts: Any) -> bytes:
+        """
+        Build the cache key for a tool call.
+        
+        Args:
+            tool_name: The name of the tool
+            *parts: The tool inputs that determine its result
+        
+        Returns:
+            The cache key
+        """
+        return hashlib.blake2b("|".join((tool_name, *map(str, parts))).encode("utf-8"), digest_size=16).digest()
+    
+    async def get_or_call(self, key: bytes, call: Awaitable[Any]) -> Any:
+        """
+        Await a tool call through the cache.
+        
+        Args:
+            key: The cache key for this call (see make_key)
+            call: The tool call to run on a cache miss (closed unawaited on a hit)
+        
+        Returns:
+            The result of the tool call
+        """
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > now:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            if not entry[1].done():
+                self.coalesced += 1
+            call.close()
+            return await asyncio.shield(entry[1])
+        
+        self.misses += 1
+        future = asyncio.ensure_future(call)
+        expiry = now + self.ttl_s if self.ttl_s is not None else float("inf")
+        self._entries[key] = (expiry, future)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        
+        try:
+            return await asyncio.shield(future)
+        except Exception:
+            # Don't cache failures
+            if self._entries.get(key, (0, None))[1] is future:
+                del self._entries[key]
+            raise
+    
+    def discard(self, key: bytes, result: Any) -> None:
+        """
+        Drop a cached result, e.g. one that turned out to be incomplete. The entry is
+        only removed if it still holds that result, not a newer call made since.
+        
+        Args:
+            key: The cache key (see make_key)
+            result: The result to drop
+        """
+        entry = self._entries.get(key)
+        if entry is not None and entry[1].done() and not entry[1].cancelled() \
+                and entry[1].exception() is None and entry[1].result() is result:
+            del self._entries[key]
+    
+    def stats(self) -> Dict[str, int]:
+        """
+        Get the cache's usage counters.
+        
+        Returns:
+            The number of hits (and of those, how many joined an in-flight call),
+            misses and current entries
+        """
+        return {"hits": self.hits, "coalesced": self.coalesced, "misses": self.misses, "size": len(self._entries)}
@@ -0,0 +1,105 @@
+"""
+On-disk cache of verification results, so items that recur across queries
+(re-collected news, reposted media) skip the verification pipeline.
+"""
+
+import asyncio
+import hashlib
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+from app.logging_config import logger
+from app.serialization import dumps, loads
+
+class VerificationCache:
+    """
+    SQLite-backed cache mapping an item's (url, media hash) to its verification results.
+    All database access runs on a single worker thread so the event loop never blocks on disk I/O.
+    """
+    
+    def __init__(self, path: str, ttl_s: float):
+        """
+        Initialize the cache. The database is opened lazily on first use.
+        
+        Args:
+            path: Path to the SQLite database file
+            ttl_s: How long cached results stay valid, in seconds
+        """
+        self.path = path
+        self.ttl_s = ttl_s
+        self._conn: Optional[sqlite3.Connection] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="verification-cache")
+    
+    @staticmethod
+    def make_key(url: str, media_hash: str = "") -> str:
+        """
+        Build the cache key for an item.
+        
+        Args:
+            url: The item's URL
+            media_hash: The content hash of the item's media, if any
+        
+        Returns:
+            The cache key
+        """
+        return hashlib.blake2b(f"{url}|{media_hash}".encode("utf-8"), digest_size=16).hexdigest()
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use (called on the worker thread)."""
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS verif (key TEXT PRIMARY KEY, ts REAL, json BLOB)")
+            self._conn = conn
+        return self._conn
+    
+    def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Read an unexpired entry (called on the worker thread)."""
+        row = self._connect().execute(
+            "SELECT json FROM verif WHERE key = ? AND ts > ?",
+            (key, time.time() - self.ttl_s)
+        ).fetchone()
+        return loads(row[0]) if row else None
+    
+    def _set(self, key: str, value: Dict[str, Any]) -> None:
+        """Write an entry (called on the worker thread)."""
+        self._connect().execute(
+            "INSERT OR REPLACE INTO verif (key, ts, json) VALUES (?, ?, ?)",
+            (key, time.time(), dumps(value))
+        )
+    
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up cached verification results.
+        
+        Args:
+            key: The cache key (see make_key)
+        
+        Returns:
+            The cached results, or None on a miss, an expired entry, or a cache error
+        """
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, self._get, key)
+        except (sqlite3.Error, OSError, ValueError) as e:
+            logger.warning("Verification cache lookup failed: %s", e)
+            return None
+    
+    async def set(self, key: str, value: Dict[str, Any]) -> None:
+        """
+        Store verification results. Errors are logged and otherwise ignored.
+        
+        Args:
+            key: The cache key (see make_key)
+            value: The results to store
+        """
+        try:
+            await asyncio.get_running_loop().run_in_executor(self._executor, self._set, key, value)
+        except (sqlite3.Error, OSError, TypeError) as e:
+            logger.warning("Verification cache write failed: %s", e)
@@ -12,10 +12,87 @@ Checks if the OSINT system can run properly by verifying:
 import os
 import sys
 import platform
-import importlib
-import pkg_resources
+import re
+import io
+import asyncio
+import argparse
+import functools
+import importlib.util
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from importlib.metadata import distributions
 import dotenv
 
+REQUIRED_PACKAGES = (
+    "fastapi",
+    "uvicorn",
+    "pydantic",
+    "python-dotenv",
+    "openai",
+    "websockets",
+    "requests",
+    "aiohttp",
+    "sqlalchemy",
+)
+
+# Installed with the 'gui' extra; only checked with --gui
+GUI_PACKAGES = (
+    "pyside6",
+    "qasync",
+)
+
+REQUIRED_ENV_VARS = (
+    "OPENAI_API_KEY",
+    "BING_API_KEY",
+    "GOOGLE_GEOCODE_API_KEY",
+)
+
+REQUIRED_DIRS = (
+    "app/data",
+    "app/data/media",
+)
+
+# Whether the .env file has been loaded yet
+_DOTENV_LOADED = False
+_DOTENV_LOCK = threading.Lock()
+
+def _ensure_env():
+    """Load the .env file into the environment, once."""
+    global _DOTENV_LOADED
+    with _DOTENV_LOCK:
+        if not _DOTENV_LOADED:
+            dotenv.load_dotenv()
+            _DOTENV_LOADED = True
+
+class _ThreadOutput(io.TextIOBase):
+    """
+    Stand-in for sys.stdout that sends each thread's output to that thread's buffer,
+    if it has one, so checks running concurrently don't interleave their output.
+    """
+    
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+    
+    def capture(self, buffer):
+        """Send the calling thread's output to buffer (or back to the stream, if None)."""
+        self._local.buffer = buffer
+    
+    def write(self, text):
+        return (getattr(self._local, "buffer", None) or self._stream).write(text)
+    
+    def flush(self):
+        self._stream.flush()
+
+def _run_captured(output, check):
+    """Run a check on a worker thread, returning its result and everything it printed."""
+    buffer = io.StringIO()
+    output.capture(buffer)
+    try:
+        return check(), buffer.getvalue()
+    finally:
+        output.capture(None)
+
 def check_python_version():
     """Check if Python version is compatible."""
     print("\n=== Python Version Check ===")
@@ -32,30 +109,28 @@ def check_python_version():
         print("❌ Python version is not compatible")
         return False
 
-def check_required_packages():
-    """Check if all required packages are installed."""
+def _normalize_name(name):
+    """Normalize a distribution name for comparison (PEP 503)."""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+def check_required_packages(include_gui=False):
+    """Check if all required packages (and, with include_gui, the GUI's) are installed."""
     print("\n=== Package Check ===")
-    required_packages = [
-        "fastapi",
-        "uvicorn",
-        "pydantic",
-        "python-dotenv",
-        "openai",
-        "pyside6",
-        "websockets",
-        "requests",
-        "aiohttp",
-        "sqlalchemy",
-    ]
+    required_packages = REQUIRED_PACKAGES + GUI_PACKAGES if include_gui else REQUIRED_PACKAGES
+    
+    # Read installed distributions' metadata once instead of importing each package
+    installed = {}
+    for dist in distributions():
+        name = dist.metadata["Name"]
+        if name:
+            installed.setdefault(_normalize_name(name), dist.version)
     
-    missing_packages = []
+    missing_packages = [package for package in required_packages if _normalize_name(package) not in installed]
     for package in required_packages:
-        try:
-            importlib.import_module(package.replace("-", "_"))
-            print(f"✅ {package} is installed")
-        except ImportError:
-            missing_packages.append(package)
+        if package in missing_packages:
             print(f"❌ {package} is not installed")
+        else:
+            print(f"✅ {package} is installed")
     
     if missing_packages:
         print(f"\nMissing packages: {', '.join(missing_packages)}")
@@ -63,10 +138,10 @@ def check_required_packages():
         return False
     
     # Also check package versions
-    try:
-        import camel_ai
-        print(f"✅ camel-ai is installed (version: {pkg_resources.get_distribution('camel-ai').version})")
-    except (ImportError, pkg_resources.DistributionNotFound):
+    camel_version = installed.get(_normalize_name("camel-ai"))
+    if camel_version:
+        print(f"✅ camel-ai is installed (version: {camel_version})")
+    else:
         print("❌ camel-ai is not installed")
         missing_packages.append("camel-ai")
     
@@ -77,17 +152,11 @@ def check_required_packages():
 def check_environment_variables():
     """Check if required environment variables are set."""
     print("\n=== Environment Variables Check ===")
-    dotenv.load_dotenv()
-    
-    required_vars = [
-        "OPENAI_API_KEY",
-        "BING_API_KEY",
-        "GOOGLE_GEOCODE_API_KEY",
-    ]
+    _ensure_env()
     
-    missing_vars = []
-    for var in required_vars:
-        value = os.getenv(var)
+    values = {var: os.getenv(var) for var in REQUIRED_ENV_VARS}
+    missing_vars = [var for var, value in values.items() if not value]
+    for var, value in values.items():
         if value:
             if var == "OPENAI_API_KEY":
                 # Mask API key for security
@@ -96,7 +165,6 @@ def check_environment_variables():
             else:
                 print(f"✅ {var} is set")
         else:
-            missing_vars.append(var)
             print(f"❌ {var} is not set")
     
     if missing_vars:
@@ -111,70 +179,116 @@ def check_environment_variables():
 def check_directories():
     """Check if required directories exist."""
     print("\n=== Directory Check ===")
-    required_dirs = [
-        "app/data",
-        "app/data/media",
-    ]
     
-    missing_dirs = []
-    for directory in required_dirs:
-        if os.path.isdir(directory):
-            print(f"✅ {directory} exists")
-        else:
-            missing_dirs.append(directory)
-            print(f"❌ {directory} does not exist")
+    # Create each directory in one pass; an existing one is reported by makedirs itself
+    ok = True
+    for directory in REQUIRED_DIRS:
+        try:
+            os.makedirs(directory)
+            print(f"❌ {directory} did not exist, created it")
+        except FileExistsError:
+            if os.path.isdir(directory):
+                print(f"✅ {directory} exists")
+            else:
+                ok = False
+                print(f"❌ {directory} exists but is not a directory")
     
-    if missing_dirs:
-        print("\nCreating missing directories...")
-        for directory in missing_dirs:
-            os.makedirs(directory, exist_ok=True)
-            print(f"Created {directory}")
+    return ok
+
+async def _probe_openai(api_key):
+    """
+    List the API's models with the given key.
     
-    return True
+    Returns True if the key was accepted, False if it was rejected, and None if the API
+    couldn't be reached in time.
+    """
+    import aiohttp
+    
+    timeout = aiohttp.ClientTimeout(total=3)
+    try:
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            async with session.get(
+                "https://api.openai.com/v1/models",
+                headers={"Authorization": f"Bearer {api_key}"}
+            ) as response:
+                if response.status in (401, 403):
+                    print("❌ OPENAI_API_KEY is set but was rejected by the OpenAI API")
+                    return False
+                if response.status != 200:
+                    print(f"❌ OpenAI API returned HTTP {response.status}")
+                    return False
+                return True
+    except (asyncio.TimeoutError, aiohttp.ClientConnectionError) as e:
+        print(f"⚠️ Could not reach the OpenAI API, access is unverified: {str(e) or type(e).__name__}")
+        return None
 
 def check_openai_api():
-    """Check if OpenAI API can be accessed."""
+    """
+    Check if OpenAI API can be accessed.
+    
+    Returns True if the API accepted the key, False if it didn't (or the key is missing),
+    and None if the API couldn't be reached in time, which is inconclusive.
+    """
     print("\n=== OpenAI API Check ===")
+    _ensure_env()
     api_key = os.getenv("OPENAI_API_KEY")
     
     if not api_key:
         print("❌ OPENAI_API_KEY is not set, skipping API check")
         return False
     
-    try:
-        import openai
-        openai.api_key = api_key
-        
-        # Make a simple API call
-        print("Testing API access...")
-        response = openai.Completion.create(
-            model="gpt-3.5-turbo-instruct",
-            prompt="Say hello",
-            max_tokens=5
-        )
-        
-        if response and hasattr(response, "choices") and len(response.choices) > 0:
-            print(f"✅ Successfully connected to OpenAI API")
-            return True
-        else:
-            print("❌ Failed to get a valid response from OpenAI API")
-            return False
+    if importlib.util.find_spec("aiohttp") is None:
+        print("❌ aiohttp is not installed, skipping API check")
+        return False
     
+    # Listing models verifies the key without a billed completion
+    print("Testing API access...")
+    try:
+        result = asyncio.run(_probe_openai(api_key))
     except Exception as e:
         print(f"❌ Error accessing OpenAI API: {str(e)}")
         return False
+    
+    if result:
+        print(f"✅ Successfully connected to OpenAI API")
+    return result
 
 def main():
     """Run all checks."""
+    parser = argparse.ArgumentParser(description="OSINT System Check")
+    parser.add_argument(
+        "--gui",
+        action="store_true",
+        help="Also check the GUI packages (installed with the 'gui' extra)"
+    )
+    args = parser.parse_args()
+    
     print("=== OSINT System Check ===")
     print("Checking if the system can run properly...\n")
     
-    # Run all checks
-    python_ok = check_python_version()
-    packages_ok = check_required_packages()
-    env_vars_ok = check_environment_variables()
-    directories_ok = check_directories()
-    api_ok = check_openai_api()
+    # Run all checks concurrently (the API check's network round trip overlaps the local checks),
+    # then print their output in order
+    all_checks = [
+        check_python_version,
+        functools.partial(check_required_packages, include_gui=args.gui),
+        check_environment_variables,
+        check_directories,
+        check_openai_api,
+    ]
+    stdout = sys.stdout
+    output = _ThreadOutput(stdout)
+    sys.stdout = output
+    try:
+        with ThreadPoolExecutor(max_workers=len(all_checks)) as executor:
+            futures = [executor.submit(_run_captured, output, check) for check in all_checks]
+            results = []
+            for future in futures:
+                result, printed = future.result()
+                output.write(printed)
+                results.append(result)
+    finally:
+        sys.stdout = stdout
+    python_ok, packages_ok, env_vars_ok, directories_ok, api_ok = results
     
     # Summarize results
     print("\n=== Check Summary ===")
@@ -188,8 +302,13 @@ def main():
     
     all_ok = True
     for check_name, result in checks:
-        status = "✅ PASS" if result else "❌ FAIL"
-        if not result:
+        # None means the check was inconclusive, which doesn't fail the system check
+        if result is None:
+            status = "⚠️ INCONCLUSIVE"
+        elif result:
+            status = "✅ PASS"
+        else:
+            status = "❌ FAIL"
             all_ok = False
         print(f"{check_name}: {status}")
     
@@ -6,7 +6,7 @@ A CAMEL-based multi-agent system for OSINT collection, verification, and reporti
 
 ---
 RECOMMENDATION:
-For development and debugging, it is often better to run the API server and GUI in separate terminals/processes for better isolation and easier debugging. The current approach (running both in one script, with the API in a thread) is convenient for simple use, but less robust for production or heavy use. Consider splitting them for advanced scenarios.
+For development and debugging, it is often better to run the API server and GUI in separate terminals/processes for better isolation and easier debugging. The current approach (running both in one script, with the API server on the GUI's event loop) is convenient for simple use, but less robust for production or heavy use. Consider splitting them for advanced scenarios.
 ---
 """
 
@@ -14,51 +14,30 @@ import os
 import sys
 import argparse
 import asyncio
-from threading import Thread
-import uvicorn
-import logging
-from logging import StreamHandler
-from colorama import init, Fore, Style
 
-# Initialize colorama for cross-platform colored output
-init(autoreset=True)
+from app.logging_config import logger
 
-class ColorFormatter(logging.Formatter):
-    COLORS = {
-        logging.DEBUG: Fore.CYAN,
-        logging.INFO: Fore.GREEN,
-        logging.WARNING: Fore.YELLOW,
-        logging.ERROR: Fore.RED,
-        logging.CRITICAL: Fore.MAGENTA + Style.BRIGHT,
-    }
-    def format(self, record):
-        color = self.COLORS.get(record.levelno, "")
-        reset = Style.RESET_ALL
-        record.levelname = f"{color}{record.levelname}{reset}"
-        record.msg = f"{color}{record.msg}{reset}"
-        return super().format(record)
 
-# Set up logger
-logger = logging.getLogger("osint")
-logger.setLevel(logging.DEBUG)
-handler = StreamHandler()
-formatter = ColorFormatter('[%(asctime)s] %(levelname)s: %(message)s', "%Y-%m-%d %H:%M:%S")
-handler.setFormatter(formatter)
-logger.handlers = []
-logger.addHandler(handler)
-
-
-def run_api_server():
+def run_api_server(host="0.0.0.0", port=8000):
     """Run the FastAPI server."""
-    from app.server import app
-    logger.info("Starting backend API server (FastAPI) on 0.0.0.0:8000...")
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    import uvicorn
+    from app.server import app, uvicorn_options
+    logger.info("Starting backend API server (FastAPI) on %s:%s...", host, port)
+    uvicorn.run(app, host=host, port=port, **uvicorn_options())
 
-def run_gui():
-    """Run the GUI application."""
+def run_gui(host=None, port=8000):
+    """Run the GUI application, also hosting the API server on its event loop if host is given."""
     from app.gui.main import main
+    server = None
+    if host is not None:
+        import uvicorn
+        from app.server import app, uvicorn_options
+        logger.info("Starting backend API server (FastAPI) on %s:%s...", host, port)
+        # The GUI's Qt-integrated asyncio loop runs the server, so the loop option doesn't apply
+        options = {**uvicorn_options(), "loop": "none"}
+        server = uvicorn.Server(uvicorn.Config(app, host=host, port=port, **options))
     logger.info("Launching GUI application...")
-    main()
+    main(server)
 
 def parse_args():
     """Parse command line arguments."""
@@ -91,7 +70,7 @@ def parse_args():
 def main():
     """Main entry point."""
     args = parse_args()
-    logger.info(f"Parsed arguments: mode={args.mode}, host={args.host}, port={args.port}")
+    logger.info("Parsed arguments: mode=%s, host=%s, port=%s", args.mode, args.host, args.port)
     
     # Ensure data directories exist
     os.makedirs('app/data/media', exist_ok=True)
@@ -101,18 +80,13 @@ def main():
     # (If you want to log user queries, you would do so in the API or GUI modules when the user submits a query)
     
     # Run in the selected mode
-    if args.mode in ["api", "both"]:
-        # Start API server
-        if args.mode == "both":
-            logger.info("Running in BOTH mode: launching API server in a background thread.")
-            server_thread = Thread(target=run_api_server)
-            server_thread.daemon = True
-            server_thread.start()
-        else:
-            logger.info("Running in API mode: launching API server only.")
-            run_api_server()
-    
-    if args.mode in ["gui", "both"]:
+    if args.mode == "api":
+        logger.info("Running in API mode: launching API server only.")
+        run_api_server(args.host, args.port)
+    elif args.mode == "both":
+        logger.info("Running in BOTH mode: hosting the API server on the GUI's event loop.")
+        run_gui(args.host, args.port)
+    else:
         logger.info("Running in GUI mode: launching GUI application.")
         run_gui()
 
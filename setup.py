@@ -25,15 +25,23 @@ setup(
         "pydantic>=2.3.0",
         "python-multipart>=0.0.6",
         "python-dotenv>=1.0.0",
+        "colorama>=0.4.6",
         "openai>=1.3.0",
         "camel-ai>=0.1.0",
-        "pyside6>=6.5.0",
         "websockets>=11.0.0",
         "requests>=2.31.0",
         "aiohttp>=3.8.0",
+        "aiofiles>=23.1.0",
         "sqlalchemy>=2.0.0",
         "sqlitedict>=2.1.0",
     ],
+    # The desktop GUI (main.py --mode gui/both); API-only installs don't need Qt
+    extras_require={
+        "gui": [
+            "pyside6>=6.5.0,<7",
+            "qasync>=0.24.0",
+        ],
+    },
     entry_points={
         "console_scripts": [
             "camel-osint=main:main",
@@ -0,0 +1,17 @@
+"""
+Test configuration: settings the app reads from the environment at import time.
+"""
+
+import os
+import tempfile
+
+# The OpenAI client is created at import; tests never reach the API
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+# Keep downloaded media and the verification cache out of the working tree
+_data_dir = tempfile.mkdtemp(prefix="osint-tests-")
+os.environ.setdefault("SAVE_MEDIA_PATH", os.path.join(_data_dir, "media"))
+os.environ.setdefault("VERIFIER_RESULT_CACHE_PATH", os.path.join(_data_dir, "verifier_cache.db"))
+
+# No simulated tool latency
+os.environ.setdefault("SIMULATE_LATENCY_SCALE", "0")
@@ -0,0 +1,51 @@
+import asyncio
+
+import httpx
+import openai
+import pytest
+
+from app.agents.base import BaseAgent
+from app.agents.ethical_filter import EthicalFilterAgent
+
+def timeout_error():
+    return openai.APITimeoutError(request=httpx.Request("POST", "https://api.openai.com/v1/chat/completions"))
+
+def test_with_retries_retries_transient_errors(monkeypatch):
+    delays = []
+    
+    async def sleep(delay):
+        delays.append(delay)
+    
+    monkeypatch.setattr("app.agents.base.asyncio.sleep", sleep)
+    agent = BaseAgent("Test", "")
+    attempts = []
+    
+    async def request():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise timeout_error()
+        return "ok"
+    
+    assert asyncio.run(agent._with_retries(request)) == "ok"
+    assert len(attempts) == 2
+    assert len(delays) == 1
+
+def test_with_retries_raises_non_transient_errors():
+    agent = BaseAgent("Test", "")
+    
+    async def request():
+        raise ValueError("bad request")
+    
+    with pytest.raises(ValueError):
+        asyncio.run(agent._with_retries(request))
+
+def test_ethical_filter_falls_back_when_the_llm_fails():
+    agent = EthicalFilterAgent()
+    
+    async def call_llm(messages):
+        raise timeout_error()
+    
+    agent.call_llm = call_llm
+    report = asyncio.run(agent.filter("# Report\n\nThe bridge was damaged on Monday."))
+    
+    assert "The bridge was damaged on Monday." in report
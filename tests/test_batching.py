@@ -0,0 +1,39 @@
+import asyncio
+
+import pytest
+
+from app.batching import AsyncBatcher
+
+def test_items_are_processed_in_one_batch():
+    batches = []
+    
+    async def process_batch(items):
+        batches.append(items)
+        return [item * 2 for item in items]
+    
+    async def run():
+        batcher = AsyncBatcher(3, 50, process_batch)
+        return await asyncio.gather(*[batcher.submit(i) for i in range(3)])
+    
+    assert asyncio.run(run()) == [0, 2, 4]
+    assert batches == [[0, 1, 2]]
+
+def test_cancelled_dispatch_cancels_waiting_callers():
+    started = None
+    
+    async def process_batch(items):
+        started.set()
+        await asyncio.sleep(60)
+    
+    async def run():
+        nonlocal started
+        started = asyncio.Event()
+        batcher = AsyncBatcher(1, 50, process_batch)
+        submission = asyncio.create_task(batcher.submit("item"))
+        await started.wait()
+        for task in batcher._dispatch_tasks:
+            task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(submission, 1)
+    
+    asyncio.run(run())
@@ -0,0 +1,91 @@
+import asyncio
+
+from app.models import CollectedItem, WorkflowContext
+from app.orchestrator import Orchestrator, _canonical_key
+
+class FakeCollector:
+    """Collector that yields fixed batches of items."""
+    
+    def __init__(self, *batches):
+        self.batches = batches
+    
+    async def collect_stream(self, query, max_results):
+        for batch in self.batches:
+            yield batch
+
+def run_collection(orchestrator, ctx):
+    """Run the collection stage on its own, returning the items it queued."""
+    async def run():
+        ctx.collected_queue = asyncio.Queue(maxsize=100)
+        await orchestrator._run_collection(ctx, lambda status: None)
+        queued = []
+        while (item := ctx.collected_queue.get_nowait()) is not None:
+            queued.append(item)
+        return queued
+    
+    return asyncio.run(run())
+
+def test_urlless_items_without_title_or_content_have_no_key():
+    item = CollectedItem(id="web_0", source="web", source_name="Unknown", url="")
+    assert _canonical_key(item) is None
+
+def test_urlless_web_items_are_not_deduplicated():
+    orchestrator = Orchestrator()
+    orchestrator.collector_agent = FakeCollector([
+        CollectedItem(id="web_0", source="web", source_name="Unknown", url=""),
+        CollectedItem(id="web_1", source="web", source_name="Unknown", url="")
+    ])
+    ctx = WorkflowContext("query")
+    
+    queued = run_collection(orchestrator, ctx)
+    
+    assert [item.id for item in queued] == ["web_0", "web_1"]
+    assert [item.id for item in ctx.collected_data] == ["web_0", "web_1"]
+
+def test_items_with_the_same_canonical_url_are_deduplicated():
+    orchestrator = Orchestrator()
+    orchestrator.collector_agent = FakeCollector(
+        [CollectedItem(id="web_0", source="web", source_name="Reuters", url="https://example.com/a?utm_source=x")],
+        [CollectedItem(id="news_0", source="news", source_name="Reuters", url="https://example.com/a")]
+    )
+    ctx = WorkflowContext("query")
+    
+    queued = run_collection(orchestrator, ctx)
+    
+    assert [item.id for item in queued] == ["web_0"]
+
+def test_slow_verifier_blocks_collection_and_sets_queue_pressure():
+    items = [CollectedItem(id=f"web_{i}", source="web", source_name="Reuters", url=f"https://example.com/{i}") for i in range(20)]
+    orchestrator = Orchestrator()
+    orchestrator.collector_agent = FakeCollector(items)
+    verifier = orchestrator.verifier_agent
+    verifier._max_in_flight = 2
+    
+    async def filter_reliable(collected, cache):
+        return [(item, {"reliability": "reliable"}) for item in collected]
+    
+    async def verify_item(item, source_reliability):
+        await asyncio.sleep(60)
+        return item
+    
+    verifier._filter_reliable = filter_reliable
+    verifier._verify_item = verify_item
+    
+    async def run():
+        ctx = WorkflowContext("query")
+        ctx.collected_queue = asyncio.Queue(maxsize=4)
+        collection = asyncio.create_task(orchestrator._run_collection(ctx, lambda status: None))
+        verification = asyncio.create_task(orchestrator._run_verification(ctx, lambda status: None))
+        try:
+            await asyncio.sleep(1.5)
+            # The verifier holds at most one batch beyond its limit, so the collector is stuck on a full queue
+            assert not collection.done()
+            assert ctx.collected_queue.full()
+            assert len(ctx.collected_data) < len(items)
+            assert ctx.queue_pressure
+        finally:
+            collection.cancel()
+            verification.cancel()
+            await asyncio.gather(collection, verification, return_exceptions=True)
+    
+    asyncio.run(run())
@@ -0,0 +1,66 @@
+import asyncio
+
+from app.tools import search
+
+def test_cached_results_are_not_shared_with_callers():
+    calls = []
+    
+    @search._cached_search
+    async def fake_search(query: str):
+        calls.append(query)
+        return {"web": [{"title": "original"}], "news": []}
+    
+    async def run():
+        first = await fake_search("test_cached_results_are_not_shared_with_callers")
+        first["web"][0]["title"] = "modified"
+        first["news"].append({"title": "added"})
+        return await fake_search("test_cached_results_are_not_shared_with_callers")
+    
+    second = asyncio.run(run())
+    
+    assert len(calls) == 1
+    assert second == {"web": [{"title": "original"}], "news": []}
+
+class FakeResponses:
+    def __init__(self, text):
+        self.text = text
+        self.calls = 0
+    
+    async def create(self, **kwargs):
+        self.calls += 1
+        return type("Response", (), {"output": None, "output_text": self.text})()
+
+class FakeOpenAIClient:
+    def __init__(self, text):
+        self.responses = FakeResponses(text)
+    
+    def with_options(self, **kwargs):
+        return self
+
+def test_combined_search_fallback_is_not_cached(monkeypatch):
+    client = FakeOpenAIClient("not json")
+    monkeypatch.setattr(search, "get_openai_client", lambda: client)
+    query = "test_combined_search_fallback_is_not_cached"
+    
+    async def run():
+        first = await search.combined_search(query)
+        second = await search.combined_search(query)
+        return first, second
+    
+    first, second = asyncio.run(run())
+    
+    assert first == second == {"web": [{"text": "not json", "citations": []}], "news": []}
+    assert type(first) is dict
+    assert client.responses.calls == 2
+
+def test_combined_search_results_are_cached(monkeypatch):
+    client = FakeOpenAIClient('{"web": [{"title": "a"}], "news": []}')
+    monkeypatch.setattr(search, "get_openai_client", lambda: client)
+    query = "test_combined_search_results_are_cached"
+    
+    async def run():
+        await search.combined_search(query)
+        return await search.combined_search(query)
+    
+    assert asyncio.run(run()) == {"web": [{"title": "a"}], "news": []}
+    assert client.responses.calls == 1